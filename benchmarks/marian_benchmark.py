@@ -0,0 +1,134 @@
+# benchmarks/marian_benchmark.py
+"""
+Quality/latency comparison of MarianTranslator inference modes, per language pair.
+
+    python benchmarks/marian_benchmark.py --pairs en-ur ur-en en-ar [--sentences file.txt]
+                                          [--references refs.txt] [--threads 4] [--onnx]
+
+For every pair each mode translates the same sentences. The report lists load time,
+sentences/sec and chrF. chrF is scored against --references when given. Otherwise it is
+scored against the stock fp32 output, i.e. how much quality the optimization gives up.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.translators import MarianInferenceConfig, MarianTranslator  # noqa: E402
+
+SAMPLE_SENTENCES = {
+    "en": [
+        "The meeting has been moved to Thursday afternoon.",
+        "Please send me the report before the end of the day.",
+        "How long does it take to get to the airport from here?",
+        "The weather is expected to improve over the weekend.",
+        "We need to buy more vegetables for dinner tonight.",
+        "She has been studying medicine at the university for three years.",
+        "Could you tell me where the nearest pharmacy is?",
+        "The new policy will take effect at the beginning of next month.",
+    ],
+    "ur": [
+        "میٹنگ جمعرات کی دوپہر تک ملتوی کر دی گئی ہے۔",
+        "براہ کرم دن ختم ہونے سے پہلے مجھے رپورٹ بھیج دیں۔",
+        "یہاں سے ہوائی اڈے تک پہنچنے میں کتنا وقت لگتا ہے؟",
+        "ہفتے کے آخر میں موسم بہتر ہونے کی توقع ہے۔",
+    ],
+    "ar": [
+        "تم تأجيل الاجتماع إلى بعد ظهر يوم الخميس.",
+        "من فضلك أرسل لي التقرير قبل نهاية اليوم.",
+        "كم من الوقت يستغرق الوصول إلى المطار من هنا؟",
+        "من المتوقع أن يتحسن الطقس خلال عطلة نهاية الأسبوع.",
+    ],
+}
+
+
+def chrf(hypothesis: str, reference: str, max_order: int = 6, beta: float = 2.0) -> float:
+    """Character n-gram F-score (chrF), 0-100."""
+    hyp, ref = hypothesis.replace(" ", ""), reference.replace(" ", "")
+    precisions, recalls = [], []
+    for n in range(1, max_order + 1):
+        hyp_ngrams = Counter(hyp[i:i + n] for i in range(len(hyp) - n + 1))
+        ref_ngrams = Counter(ref[i:i + n] for i in range(len(ref) - n + 1))
+        if not hyp_ngrams or not ref_ngrams:
+            continue
+        overlap = sum((hyp_ngrams & ref_ngrams).values())
+        precisions.append(overlap / sum(hyp_ngrams.values()))
+        recalls.append(overlap / sum(ref_ngrams.values()))
+    if not precisions:
+        return 0.0
+    p, r = sum(precisions) / len(precisions), sum(recalls) / len(recalls)
+    if p + r == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * p * r / (beta ** 2 * p + r)
+
+
+def read_lines(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run_mode(config: MarianInferenceConfig, pair: tuple, sentences: list, repeats: int):
+    translator = MarianTranslator(inference=config, memory_budget=None, pivot_lang=None)
+    start = time.perf_counter()
+    tokenizer, model = translator.load_model(*pair)
+    load_time = time.perf_counter() - start
+    if model is None:
+        return None
+
+    translator.translate_batch(sentences[:1], *pair)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        outputs = translator.translate_batch(sentences, *pair)
+    elapsed = (time.perf_counter() - start) / repeats
+    return {"load": load_time, "throughput": len(sentences) / elapsed, "outputs": outputs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", nargs="+", default=["en-ur", "ur-en"])
+    parser.add_argument("--sentences", help="one source sentence per line (default: built-in samples)")
+    parser.add_argument("--references", help="one reference translation per line, aligned with --sentences")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--onnx", action="store_true", help="also benchmark the onnxruntime export")
+    args = parser.parse_args()
+
+    modes = {
+        "stock": MarianInferenceConfig(num_threads=args.threads),
+        "greedy": MarianInferenceConfig(num_threads=args.threads, num_beams=1, max_length_ratio=2.0),
+        "int8": MarianInferenceConfig.optimized(num_threads=args.threads),
+    }
+    if args.onnx:
+        modes["onnx"] = MarianInferenceConfig(num_threads=args.threads, num_beams=1, max_length_ratio=2.0, runtime="onnx")
+
+    for pair_name in args.pairs:
+        pair = tuple(pair_name.split("-"))
+        sentences = read_lines(args.sentences) if args.sentences else SAMPLE_SENTENCES.get(pair[0], [])
+        references = read_lines(args.references) if args.references else None
+        if not sentences:
+            print(f"\n{pair_name}: no sentences for source language {pair[0]}")
+            continue
+
+        print(f"\n{pair_name} ({len(sentences)} sentences)")
+        print(f"{'mode':8} {'load (s)':>9} {'sent/s':>8} {'chrF':>7}")
+        baseline = None
+        for mode_name, config in modes.items():
+            result = run_mode(config, pair, sentences, args.repeats)
+            if result is None:
+                print(f"{mode_name:8} {'model unavailable':>26}")
+                continue
+            if baseline is None:
+                baseline = result["outputs"]
+            targets = references or baseline
+            score = sum(chrf(h or "", r) for h, r in zip(result["outputs"], targets)) / len(targets)
+            print(f"{mode_name:8} {result['load']:9.2f} {result['throughput']:8.1f} {score:7.1f}")
+
+        if not references:
+            print("(chrF is relative to the stock output; pass --references for absolute quality)")
+
+
+if __name__ == "__main__":
+    main()
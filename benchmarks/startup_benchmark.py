@@ -0,0 +1,101 @@
+# benchmarks/startup_benchmark.py
+"""
+Measures import cost of the app's modules and time until the main window is shown.
+Each measurement runs in a fresh interpreter so nothing is already cached in sys.modules.
+
+    python benchmarks/startup_benchmark.py [--runs 3] [--budget 1.0]
+
+Exits non-zero if the window takes longer than --budget seconds, or if torch/transformers
+get imported during start-up (they should only load with the first Marian translation).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "services.translators",
+    "services.translation_manager",
+    "services.speech_worker",
+    "services.tts_engine",
+    "gui.main_window",
+]
+
+HEAVY_MODULES = ["torch", "transformers"]
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+WINDOW_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from admin import Admin
+admin = Admin()
+admin.show()
+app.processEvents()
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed)
+print(",".join(heavy))
+admin.main_window.translator.shutdown()
+"""
+
+
+def run_snippet(code: str) -> list:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+        capture_output=True, text=True, timeout=300
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "failed")
+    return result.stdout.strip().splitlines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.0, help="max seconds until the window is shown")
+    args = parser.parse_args()
+
+    print(f"{'module':35} {'median import (ms)':>20}")
+    for module in MODULES:
+        try:
+            times = [float(run_snippet(IMPORT_SNIPPET.format(module=module))[-1]) for _ in range(args.runs)]
+            print(f"{module:35} {statistics.median(times) * 1000:20.1f}")
+        except Exception as e:
+            print(f"{module:35} {'error: ' + str(e):>20}")
+
+    ok = True
+    try:
+        samples = [run_snippet(WINDOW_SNIPPET.format(heavy=HEAVY_MODULES)) for _ in range(args.runs)]
+    except Exception as e:
+        print(f"\nWindow start-up failed: {e}")
+        return 1
+
+    window_time = statistics.median(float(s[0]) for s in samples)
+    heavy = {m for s in samples if len(s) > 1 for m in s[1].split(",") if m}
+    print(f"\nTime to window shown: {window_time:.3f}s (budget {args.budget:.1f}s)")
+    if window_time > args.budget:
+        print("❌ Start-up is over budget")
+        ok = False
+    if heavy:
+        print(f"❌ Heavy modules imported during start-up: {', '.join(sorted(heavy))}")
+        ok = False
+    if ok:
+        print("✅ Start-up within budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
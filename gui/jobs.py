@@ -0,0 +1,185 @@
+# gui/jobs.py
+
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class Job:
+    """Handle passed to a job function: report progress and check for cancellation."""
+    def __init__(self, job_id: int, channel: str, runner: "JobRunner"):
+        self.id = job_id
+        self.channel = channel
+        self._runner = runner
+        self._cancel_event = threading.Event()
+
+    def progress(self, partial):
+        """Thread-safe; the value is delivered to on_progress on the GUI thread."""
+        if not self.cancelled:
+            self._runner._progress.emit(self.id, partial)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+
+class _Task(QRunnable):
+    def __init__(self, job: Job, fn: Callable[[Job], object], runner: "JobRunner"):
+        super().__init__()
+        self.job = job
+        self.fn = fn
+        self.runner = runner
+
+    def run(self):
+        try:
+            result = self.fn(self.job)
+        except Exception as e:
+            self.runner._failed.emit(self.job.id, str(e))
+            return
+        self.runner._finished.emit(self.job.id, result)
+
+
+class _Entry:
+    def __init__(self, job: Job, fn, on_result, on_progress, on_error):
+        self.job = job
+        self.fn = fn
+        self.on_result = on_result
+        self.on_progress = on_progress
+        self.on_error = on_error
+
+
+class JobRunner(QObject):
+    """
+    Shared background job layer for the pages. Work runs on a QThreadPool; results, progress
+    and errors come back through queued signals, so callbacks always run on the GUI thread.
+
+    Jobs are grouped into channels. Submitting with supersede=True cancels everything still
+    pending on that channel (stale results are dropped); serial=True channels run one job at
+    a time in submission order.
+    """
+    _progress = pyqtSignal(int, object)
+    _finished = pyqtSignal(int, object)
+    _failed = pyqtSignal(int, str)
+    _posted = pyqtSignal(object, object)
+
+    def __init__(self, max_threads: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool()
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._entries: Dict[int, _Entry] = {}
+        self._channels: Dict[str, List[int]] = {}  # queued or running, not yet cancelled
+        self._serial_channels = set()
+        self._running: Dict[str, int] = {}  # serial channel -> job currently on the pool
+        self._started = set()
+
+        self._progress.connect(self._on_progress)
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+        self._posted.connect(self._on_posted)
+
+    def submit(self, channel: str, fn: Callable[[Job], object],
+               on_result: Optional[Callable[[object], None]] = None,
+               on_progress: Optional[Callable[[object], None]] = None,
+               on_error: Optional[Callable[[str], None]] = None,
+               supersede: bool = True, serial: bool = False) -> Job:
+        if supersede:
+            self.cancel(channel)
+        if serial:
+            self._serial_channels.add(channel)
+
+        job = Job(next(self._ids), channel, self)
+        self._entries[job.id] = _Entry(job, fn, on_result, on_progress, on_error)
+        self._channels.setdefault(channel, []).append(job.id)
+
+        if channel not in self._serial_channels:
+            self._start(job.id)
+        else:
+            self._start_next(channel)
+        return job
+
+    def cancel(self, channel: str):
+        """Cancel every pending or running job on a channel; their callbacks will not fire."""
+        for job_id in self._channels.pop(channel, []):
+            if job_id in self._started:
+                self._entries[job_id].job.cancel()
+            else:
+                self._entries.pop(job_id).job.cancel()  # never reached the pool
+
+    def cancel_all(self):
+        for channel in list(self._channels):
+            self.cancel(channel)
+
+    def is_busy(self, channel: str) -> bool:
+        return bool(self._channels.get(channel)) or channel in self._running
+
+    def post(self, fn: Callable[[object], None], value):
+        """Thread-safe: run fn(value) on the GUI thread, e.g. for updates that outlive their job."""
+        self._posted.emit(fn, value)
+
+    def _start(self, job_id: int):
+        entry = self._entries[job_id]
+        self._started.add(job_id)
+        self.pool.start(_Task(entry.job, entry.fn, self))
+
+    def _start_next(self, channel: str):
+        # A cancelled job keeps its serial slot until it actually returns, so work never overlaps
+        if channel in self._running:
+            return
+        queue = self._channels.get(channel)
+        if queue:
+            self._running[channel] = queue[0]
+            self._start(queue[0])
+
+    def _complete(self, job_id: int) -> Optional[_Entry]:
+        """Retire a job; returns its entry only if its callbacks should still run."""
+        entry = self._entries.pop(job_id, None)
+        self._started.discard(job_id)
+        if entry is None:
+            return None
+        channel = entry.job.channel
+        queue = self._channels.get(channel, [])
+        if job_id in queue:
+            queue.remove(job_id)
+        if not queue:
+            self._channels.pop(channel, None)
+        if self._running.get(channel) == job_id:
+            del self._running[channel]
+            self._start_next(channel)
+        return None if entry.job.cancelled else entry
+
+    @pyqtSlot(object, object)
+    def _on_posted(self, fn, value):
+        fn(value)
+
+    @pyqtSlot(int, object)
+    def _on_progress(self, job_id, partial):
+        entry = self._entries.get(job_id)
+        if entry and entry.on_progress and not entry.job.cancelled:
+            entry.on_progress(partial)
+
+    @pyqtSlot(int, object)
+    def _on_finished(self, job_id, result):
+        entry = self._complete(job_id)
+        if entry and entry.on_result:
+            entry.on_result(result)
+
+    @pyqtSlot(int, str)
+    def _on_failed(self, job_id, message):
+        entry = self._complete(job_id)
+        if entry is None:
+            return
+        if entry.on_error:
+            entry.on_error(message)
+        else:
+            print(f"[JobRunner] {entry.job.channel} failed: {message}")
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.waitForDone(2000)
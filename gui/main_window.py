@@ -6,10 +6,12 @@ from PyQt6.QtCore import pyqtSignal
 import sounddevice as sd
 
 from services.translation_manager import TranslationManager
+from gui.jobs import JobRunner
 from gui.pages.text_to_text_page import TextToTextPage
 from gui.pages.text_to_speech_page import TextToSpeechPage
 from gui.pages.speech_to_text_page import SpeechToTextPage
 from gui.pages.speech_to_speech_page import SpeechToSpeechPage
+from gui.pages.translate_page import TranslatePage
 
 
 class MainWindow(QWidget):
@@ -26,6 +28,7 @@ class MainWindow(QWidget):
         self.current_from_language = "en"
         self.current_to_language = "en"
         self.translator = TranslationManager()
+        self.jobs = JobRunner()  # background translation/TTS work shared by all pages
 
         self.from_lang_combo = QComboBox()
         self.to_lang_combo = QComboBox()
@@ -67,17 +70,20 @@ class MainWindow(QWidget):
         self.text_to_speech_btn = QPushButton("Text → Speech")
         self.speech_to_text_btn = QPushButton("Speech → Text")
         self.speech_to_speech_btn = QPushButton("Speech → Speech")
+        self.document_btn = QPushButton("Document")
 
         self.text_to_text_btn.clicked.connect(lambda: self.switch_page(0))
         self.text_to_speech_btn.clicked.connect(lambda: self.switch_page(1))
         self.speech_to_text_btn.clicked.connect(lambda: self.switch_page(2))
         self.speech_to_speech_btn.clicked.connect(lambda: self.switch_page(3))
+        self.document_btn.clicked.connect(lambda: self.switch_page(4))
 
         layout = QHBoxLayout()
         layout.addWidget(self.text_to_text_btn)
         layout.addWidget(self.text_to_speech_btn)
         layout.addWidget(self.speech_to_text_btn)
         layout.addWidget(self.speech_to_speech_btn)
+        layout.addWidget(self.document_btn)
         return layout
 
     def _init_pages(self):
@@ -85,12 +91,14 @@ class MainWindow(QWidget):
         self.text_to_speech_page = TextToSpeechPage(self.translator, self)
         self.speech_to_text_page = SpeechToTextPage(self.translator, self)
         self.speech_to_speech_page = SpeechToSpeechPage(self.translator, self)
+        self.translate_page = TranslatePage(self.translator, self)
 
         self.pages = [
             self.text_to_text_page,
             self.text_to_speech_page,
             self.speech_to_text_page,
-            self.speech_to_speech_page
+            self.speech_to_speech_page,
+            self.translate_page
         ]
 
         self.stack = QStackedLayout()
@@ -144,6 +152,8 @@ class MainWindow(QWidget):
         to_lang = self.languages.get(self.to_lang_combo.currentText(), "en")
         self.current_from_language = from_lang
         self.current_to_language = to_lang
+        # Predictive: the model for the new pair loads while the user is still typing/speaking
+        self.translator.warm_up(from_lang, to_lang)
         self.languageChanged.emit(from_lang, to_lang)
 
     def set_languages(self, from_lang: str, to_lang: str):
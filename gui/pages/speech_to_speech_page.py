@@ -1,8 +1,10 @@
+import threading
+
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QPushButton
 from PyQt6.QtCore import pyqtSlot
 
 from services.speech_worker import SpeechWorker, LANGUAGE_CODE_MAP
-from services.tts_engine import TTSEngine
+from services.tts_service import get_tts_service, PRIORITY_HIGH, PRIORITY_NORMAL
 
 
 class SpeechToSpeechPage(QWidget):
@@ -16,9 +18,12 @@ class SpeechToSpeechPage(QWidget):
         self.listening = False
         self.worker = None
         self.last_translated_text = ""
+        # Speak the best translation available within this budget; LLaMA's pick may refine it later
+        self.translation_deadline_ms = 3000
 
-        self.tts = TTSEngine()
+        self.tts = get_tts_service()
         self.is_speaking = False
+        self._request = None
 
         # UI components
         self.listen_button = QPushButton("🎤 Start Listening")
@@ -55,7 +60,7 @@ class SpeechToSpeechPage(QWidget):
             self.stop_listening()
 
     def start_listening(self):
-        if self.worker is not None:
+        if self.worker is not None and self.worker.listening:
             return
 
         lang_code = LANGUAGE_CODE_MAP.get(self.from_lang, "en-US")
@@ -65,26 +70,87 @@ class SpeechToSpeechPage(QWidget):
             self.stop_listening()
             return
 
-        self.worker = SpeechWorker(lang_code, mic_index=mic_index)
-        self.worker.result_ready.connect(self.handle_recognized_text)
-        self.worker.error_occurred.connect(self.handle_error)
+        # One worker per page, reused across starts; the microphone stream itself is shared
+        if self.worker is None:
+            self.worker = SpeechWorker(lang_code, mic_index=mic_index)
+            self.worker.result_ready.connect(self.handle_recognized_text)
+            self.worker.error_occurred.connect(self.handle_error)
+        else:
+            self.worker.set_lang_code(lang_code)
+            self.worker.set_mic_index(mic_index)
         self.worker.start_listening()
         self.listening = True
 
     def stop_listening(self):
         if self.worker:
             self.worker.stop_listening()
-            self.worker = None
         self.listening = False
         self.listen_button.setText("🎤 Start Listening")
 
     @pyqtSlot(str)
     def handle_recognized_text(self, text):
         self.recognized_text.append(text)
-        translated = self.translator.translate(text, self.from_lang, self.to_lang)
+        from_lang, to_lang = self.from_lang, self.to_lang
+        jobs = self.main_window.jobs
+
+        def work(job):
+            # The provisional result and its refinements are delivered under one lock, so the page
+            # always sees the provisional first; refinements that land while translate() is still
+            # returning are held until it has been delivered.
+            lock = threading.Lock()
+            provisional = [None]
+            early = []
+
+            def deliver(upgraded):
+                # Caller holds the lock
+                jobs.post(self.handle_refined_translation, (provisional[0], upgraded))
+                if not provisional[0]:
+                    provisional[0] = upgraded  # an empty provisional: this one gets shown and spoken instead
+
+            def on_refined(upgraded):
+                with lock:
+                    if provisional[0] is None:
+                        early.append(upgraded)
+                    elif not job.cancelled:
+                        deliver(upgraded)
+
+            translated = self.translator.translate(
+                text, from_lang, to_lang, deadline_ms=self.translation_deadline_ms,
+                cancelled=lambda: job.cancelled, on_refined=on_refined
+            )
+            with lock:
+                provisional[0] = translated
+                if job.cancelled:
+                    return
+                # progress and post share the runner's queued signals, so emission order is delivery order
+                job.progress(translated)
+                for upgraded in early:
+                    deliver(upgraded)
+
+        # Serial and not superseding: every utterance is translated and spoken, in order
+        jobs.submit(
+            "speech_to_speech", work,
+            on_progress=self.handle_translated_text,
+            on_error=lambda msg: self.translated_text.append(f"[Error] {msg}"),
+            supersede=False, serial=True
+        )
+
+    def handle_translated_text(self, translated):
+        if not translated:
+            return  # nothing arrived within the deadline; the refinement will bring the first result
         self.last_translated_text = translated
         self.translated_text.append(translated)
-        self.play_audio(translated)
+        if not translated.startswith("❌"):
+            self.play_audio(translated)
+
+    def handle_refined_translation(self, update):
+        provisional, refined = update
+        if not provisional:
+            self.handle_translated_text(refined)
+            return
+        self.translated_text.append(f"↻ {refined}")
+        if self.last_translated_text == provisional:
+            self.last_translated_text = refined  # the 🔊 Speak replay uses the better version
 
     @pyqtSlot(str)
     def handle_error(self, msg):
@@ -93,23 +159,31 @@ class SpeechToSpeechPage(QWidget):
 
     def speak_last_translation(self):
         if self.last_translated_text:
-            self.play_audio(self.last_translated_text)
+            # An explicit replay jumps the queue and cuts off whatever is playing
+            self.play_audio(self.last_translated_text, priority=PRIORITY_HIGH, preempt=True)
 
-    def play_audio(self, text):
+    def play_audio(self, text, priority=PRIORITY_NORMAL, preempt=False):
         self.is_speaking = True
         speaker_index = self.main_window.get_selected_output_device_index()
         if speaker_index is None:
             self.translated_text.append("[Error] No valid speaker selected.")
             return
 
-        self.tts.set_output_device(speaker_index)
-        self.tts.speak(text, self.to_lang)
-        self.is_speaking = False
+        # Utterances queue in the order spoken; if they pile up, the service drops the stalest
+        self._request = self.tts.speak(
+            text, self.to_lang, speaker_index, priority=priority, preempt=preempt,
+            on_done=lambda request: self.main_window.jobs.post(self._speaking_finished, request)
+        )
+
+    def _speaking_finished(self, request):
+        if request is self._request:
+            self.is_speaking = False
 
     @pyqtSlot(str, str)
     def update_languages(self, from_lang, to_lang):
         self.from_lang = from_lang
         self.to_lang = to_lang
+        self.main_window.jobs.cancel("speech_to_speech")
         self.stop_listening()
         self.recognized_text.clear()
         self.translated_text.clear()
@@ -117,6 +191,7 @@ class SpeechToSpeechPage(QWidget):
 
     def reset(self):
         """Reset page state when switching from it."""
+        self.main_window.jobs.cancel("speech_to_speech")
         self.stop_listening()
         self.recognized_text.clear()
         self.translated_text.clear()
@@ -42,7 +42,7 @@ class SpeechToTextPage(QWidget):
             self.stop_listening()
 
     def start_listening(self):
-        if self.worker is not None:
+        if self.worker is not None and self.worker.listening:
             return  # Prevent duplicate listeners
 
         lang_code = LANGUAGE_CODE_MAP.get(self.from_lang, "en-US")
@@ -52,24 +52,35 @@ class SpeechToTextPage(QWidget):
             self.stop_listening()
             return
 
-        self.worker = SpeechWorker(lang_code, mic_index=mic_index)
-        self.worker.result_ready.connect(self.display_text)
-        self.worker.error_occurred.connect(self.display_error)
+        # One worker per page, reused across starts; the microphone stream itself is shared
+        if self.worker is None:
+            self.worker = SpeechWorker(lang_code, mic_index=mic_index)
+            self.worker.result_ready.connect(self.display_text)
+            self.worker.error_occurred.connect(self.display_error)
+        else:
+            self.worker.set_lang_code(lang_code)
+            self.worker.set_mic_index(mic_index)
         self.worker.start_listening()
         self.listening = True
 
     def stop_listening(self):
         if self.worker:
             self.worker.stop_listening()
-            self.worker = None
         self.listening = False
         self.start_button.setText("🎤 Start Listening")
 
     @pyqtSlot(str)
     def display_text(self, text):
         self.recognized_text.append(text)
-        translated = self.translator.translate(text, self.from_lang, self.to_lang)
-        self.translated_text.append(translated)
+        from_lang, to_lang = self.from_lang, self.to_lang
+        # Serial and not superseding: every utterance is translated, in the order spoken
+        self.main_window.jobs.submit(
+            "speech_to_text",
+            lambda job: self.translator.translate(text, from_lang, to_lang, cancelled=lambda: job.cancelled),
+            on_result=self.translated_text.append,
+            on_error=lambda msg: self.translated_text.append(f"[Error] {msg}"),
+            supersede=False, serial=True
+        )
 
     @pyqtSlot(str)
     def display_error(self, msg):
@@ -80,12 +91,14 @@ class SpeechToTextPage(QWidget):
     def update_languages(self, from_lang, to_lang):
         self.from_lang = from_lang
         self.to_lang = to_lang
+        self.main_window.jobs.cancel("speech_to_text")
         self.stop_listening()
         self.recognized_text.clear()
         self.translated_text.clear()
 
     def reset(self):
         """Reset the UI state, used when switching pages."""
+        self.main_window.jobs.cancel("speech_to_text")
         self.stop_listening()
         self.recognized_text.clear()
         self.translated_text.clear() 
\ No newline at end of file
@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QTextEdit, QVBoxLayout, QPushButton, QHBoxLayout
 from PyQt6.QtCore import QTimer, pyqtSlot
 
-from services.tts_engine import TTSEngine
+from services.tts_service import get_tts_service
 
 
 class TextToSpeechPage(QWidget):
@@ -37,42 +37,62 @@ class TextToSpeechPage(QWidget):
         self.typing_timer.setSingleShot(True)
         self.typing_timer.timeout.connect(self.speak_translated_text)
 
-        self.tts = TTSEngine()
+        self.tts = get_tts_service()
         self.is_speaking = False
+        self._request = None
 
     def on_text_changed(self):
         self.typing_timer.start()
         if self.is_speaking:
             self.pause_speaking()
 
-    def translate_text(self):
+    def translate_text(self, on_translated=None):
         user_text = self.input_text.toPlainText().strip()
         if not user_text:
+            self.main_window.jobs.cancel("text_to_speech")
             self.output_text.clear()
-            return ""
-        translated = self.translator.translate(user_text, self.from_lang, self.to_lang)
-        self.output_text.setText(translated)
-        return translated
+            return
+        from_lang, to_lang = self.from_lang, self.to_lang
+
+        def work(job):
+            return self.translator.translate(
+                user_text, from_lang, to_lang, on_chunk_done=job.progress, cancelled=lambda: job.cancelled
+            )
+
+        def done(translated):
+            self.output_text.setText(translated)
+            if on_translated and translated:
+                on_translated(translated)
+
+        self.main_window.jobs.submit(
+            "text_to_speech", work, on_result=done, on_progress=self.output_text.setText,
+            on_error=lambda msg: self.output_text.setText(f"[Error] {msg}")
+        )
 
     def speak_translated_text(self):
-        translated_text = self.translate_text()
-        if translated_text:
-            self.play_audio(translated_text)
+        self.translate_text(on_translated=self.play_audio)
 
     def force_speak(self):
         self.typing_timer.stop()
         self.speak_translated_text()
 
     def pause_speaking(self):
+        # Drops queued speech and cuts off the sentence currently playing
         self.tts.stop()
         self.is_speaking = False
 
     def play_audio(self, text):
         self.is_speaking = True
         output_index = self.main_window.get_selected_output_device_index()
-        self.tts.set_output_device(output_index)
-        self.tts.speak(text, self.to_lang)
-        self.is_speaking = False
+        # The newest text replaces anything still queued or playing from earlier edits
+        self._request = self.tts.speak(
+            text, self.to_lang, output_index, preempt=True,
+            on_done=lambda request: self.main_window.jobs.post(self._speaking_finished, request)
+        )
+
+    def _speaking_finished(self, request):
+        if request is self._request:
+            self.is_speaking = False
 
     @pyqtSlot(str, str)
     def update_languages(self, from_lang, to_lang):
@@ -49,9 +49,24 @@ class TextToTextPage(QWidget):
             self.translate_text(text)
 
     def translate_text(self, text):
-        translated = self.translator.translate(text, self.from_lang, self.to_lang)
-        self.output_text.setText(translated)
-        self.last_text = text
+        from_lang, to_lang = self.from_lang, self.to_lang
+
+        def work(job):
+            # Incremental: only sentences edited since the last run are sent to the backends
+            return self.translator.translate_incremental(
+                text, from_lang, to_lang, session="text_to_text", on_chunk_done=job.progress,
+                cancelled=lambda: job.cancelled
+            )
+
+        def done(translated):
+            self.output_text.setText(translated)
+            self.last_text = text
+
+        # A newer request supersedes whatever is still translating
+        self.main_window.jobs.submit(
+            "text_to_text", work, on_result=done, on_progress=self.output_text.setText,
+            on_error=lambda msg: self.output_text.setText(f"[Error] {msg}")
+        )
 
     @pyqtSlot(str, str)
     def update_languages(self, from_lang, to_lang):
@@ -1,21 +1,17 @@
 # gui/pages/translate_page.py
-import hashlib
-import json
-import os
-import re
-import tempfile
-import threading
 from PyQt6.QtWidgets import QWidget, QTextEdit, QPushButton, QVBoxLayout
 
 
 class TranslatePage(QWidget):
-    def __init__(self, main_window, translator_manager):
+    """Large-document mode: paragraphs are shown as soon as each one is translated."""
+    def __init__(self, translator, main_window):
         super().__init__()
         self.main_window = main_window
-        self.translator = translator_manager
+        self.translator = translator
 
-        self.input_box = QTextEdit()
+        self.input_box = QTextEdit(placeholderText="Paste a document here...")
         self.output_box = QTextEdit()
+        self.output_box.setReadOnly(True)
         self.translate_button = QPushButton("Translate")
 
         layout = QVBoxLayout()
@@ -24,61 +20,38 @@ class TranslatePage(QWidget):
         layout.addWidget(self.output_box)
         self.setLayout(layout)
 
-        self.translate_button.clicked.connect(self._start_translation_thread)
+        self.translate_button.clicked.connect(self._start_translation)
 
-        self._current_translation_id = None
-        self._lock = threading.Lock()
+        self._paragraphs = []
 
-    def _start_translation_thread(self):
+    def _start_translation(self):
         input_text = self.input_box.toPlainText().strip()
+        if not input_text:
+            return
         src_lang = self.main_window.current_from_language
         dest_lang = self.main_window.current_to_language
 
-        translation_id = hashlib.md5(input_text.encode()).hexdigest()
-        self._current_translation_id = translation_id
-
-        def update_ui(partial_result: str):
-            with self._lock:
-                if self._current_translation_id == translation_id:
-                    self.output_box.setPlainText(partial_result)
-
-        def run():
-            self._translate_large_text(
-                input_text, src_lang, dest_lang, on_chunk_done=update_ui
-            )
-
-        threading.Thread(target=run, daemon=True).start()
-
-    def _split_by_sentences(self, text: str):
-        paragraphs = text.split('\n\n')
-        split_chunks = []
-        for para in paragraphs:
-            sentences = re.split(r'(?<=[.!?])\s+', para.strip())
-            cleaned = [s.strip() for s in sentences if s.strip()]
-            if cleaned:
-                split_chunks.append(cleaned)
-        return split_chunks
-
-    def _translate_large_text(self, text: str, src_lang: str, dest_lang: str, on_chunk_done=None) -> str:
-        split_chunks = self._split_by_sentences(text)
-
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.json') as tf:
-            temp_path = tf.name
-            json.dump(split_chunks, tf)
-
-        with open(temp_path, 'r') as f:
-            loaded_chunks = json.load(f)
-
-        os.remove(temp_path)
-
-        results = []
-        for para_chunks in loaded_chunks:
-            para_text = ' '.join(para_chunks)
-            translation = self.translator.translate(para_text, src_lang, dest_lang)
-            results.append(translation)
-
-            if on_chunk_done:
-                partial_result = "\n\n".join(results)
-                on_chunk_done(partial_result)
-
-        return "\n\n".join(results)
+        self._paragraphs = []
+        self.output_box.clear()
+
+        def work(job):
+            for paragraph in self.translator.translate_stream(
+                    input_text, src_lang, dest_lang, cancelled=lambda: job.cancelled
+            ):
+                if job.cancelled:
+                    return
+                job.progress(paragraph)
+
+        # Paragraphs arrive through the job runner's signals, so the widget is only touched on the GUI thread
+        self.main_window.jobs.submit(
+            "translate_document", work, on_progress=self._on_paragraph_done,
+            on_error=lambda msg: self.output_box.append(f"[Error] {msg}")
+        )
+
+    def _on_paragraph_done(self, paragraph: str):
+        self._paragraphs.append(paragraph)
+        self.output_box.setPlainText("\n\n".join(self._paragraphs))
+
+    def reset(self):
+        """Cancel any running document translation when switching pages."""
+        self.main_window.jobs.cancel("translate_document")
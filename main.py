@@ -1,10 +1,18 @@
 import sys
 from PyQt6.QtWidgets import QApplication
 from admin import Admin
+from services.audio_capture import close_all as close_audio_capture
+from services.audio_playback import close_all as close_audio_playback
+from services.tts_service import shutdown as shutdown_tts
 
 def main():
     app = QApplication(sys.argv)
     admin = Admin()  # Singleton instance manages everything
+    app.aboutToQuit.connect(admin.main_window.jobs.shutdown)
+    app.aboutToQuit.connect(admin.main_window.translator.shutdown)  # stop worker pools cleanly
+    app.aboutToQuit.connect(shutdown_tts)  # drop queued speech before the output streams close
+    app.aboutToQuit.connect(close_audio_capture)  # release the shared microphone streams
+    app.aboutToQuit.connect(close_audio_playback)  # and the shared output streams
     admin.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,273 @@
+# services/audio_capture.py
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import sounddevice as sd
+import speech_recognition as sr
+
+TARGET_SAMPLE_RATE = 16000
+
+# Calibrated energy thresholds (RMS of float samples) per input device, kept for the life of the
+# process so reopening a device never has to sit through ambient-noise calibration again.
+_calibrations: Dict[Optional[int], float] = {}
+
+
+class RingBuffer:
+    """
+    Preallocated mono float32 ring. Positions are absolute sample counts since the stream
+    started, so readers can keep their own cursor and detect when they fell behind.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.written = 0
+
+    def write(self, samples: np.ndarray):
+        n = len(samples)
+        if n > self.capacity:
+            self.written += n - self.capacity
+            samples, n = samples[-self.capacity:], self.capacity
+        start = self.written % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        self.written += n
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.written - self.capacity)
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Samples [start, end) without copying, unless the range wraps around the end of the ring."""
+        if start < self.oldest or end > self.written:
+            raise IndexError(f"range {start}:{end} outside buffered {self.oldest}:{self.written}")
+        i, j = start % self.capacity, end % self.capacity
+        if end - start == 0 or i < j or j == 0:
+            return self._data[i:i + (end - start)]
+        return np.concatenate((self._data[i:], self._data[:j]))
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """An owned copy of [start, end), for data that must outlive the ring window."""
+        return np.array(self.view(start, end), copy=True)
+
+
+class LinearResampler:
+    """Streaming linear-interpolation resampler; keeps phase across blocks so there are no seams."""
+    def __init__(self, src_rate: float, dst_rate: float):
+        self.step = src_rate / dst_rate
+        self._pos = 0.0
+        self._prev = np.zeros(1, dtype=np.float32)
+
+    def __call__(self, block: np.ndarray) -> np.ndarray:
+        data = np.concatenate((self._prev, block))
+        positions = np.arange(self._pos, len(data) - 1, self.step)
+        index = positions.astype(np.int64)
+        frac = (positions - index).astype(np.float32)
+        out = data[index] * (1 - frac) + data[index + 1] * frac
+        self._pos = (positions[-1] + self.step if len(positions) else self._pos) - (len(data) - 1)
+        self._prev = data[-1:]
+        return out
+
+
+class Utterance:
+    """One detected phrase as mono float32 samples; AudioData for cloud recognizers is built on demand."""
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self._audio_data = None
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def audio_data(self) -> sr.AudioData:
+        if self._audio_data is None:
+            pcm = (np.clip(self.samples, -1.0, 1.0) * 32767).astype(np.int16)
+            self._audio_data = sr.AudioData(pcm.tobytes(), self.sample_rate, 2)
+        return self._audio_data
+
+
+class AudioCapture:
+    """
+    One persistent input stream per device. A sounddevice callback downmixes and resamples each
+    block and writes it into a preallocated ring; a reader thread runs an energy VAD over
+    zero-copy frame views of the ring and hands every utterance to all subscribers. The device
+    is calibrated once per process; the threshold then keeps adapting to the room. With no
+    subscribers the stream is kept warm for `idle_timeout` seconds.
+    """
+    def __init__(self, device_index: Optional[int] = None, sample_rate: int = TARGET_SAMPLE_RATE,
+                 buffer_seconds: float = 30, frame_ms: int = 30, pause_threshold: float = 1.0,
+                 phrase_time_limit: Optional[float] = 15, min_phrase_seconds: float = 0.3,
+                 pre_roll_seconds: float = 0.3, calibration_seconds: float = 1.0, energy_ratio: float = 1.5,
+                 min_energy_threshold: float = 0.003, dynamic_damping: float = 0.15, idle_timeout: float = 60):
+        self.device_index = device_index
+        self.sample_rate = sample_rate
+        self.ring = RingBuffer(int(buffer_seconds * sample_rate))
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.pause_threshold = pause_threshold
+        self.phrase_time_limit = phrase_time_limit
+        self.min_phrase_seconds = min_phrase_seconds
+        self.pre_roll_seconds = pre_roll_seconds
+        self.calibration_seconds = calibration_seconds
+        self.energy_ratio = energy_ratio
+        self.min_energy_threshold = min_energy_threshold
+        # Same idea as speech_recognition's dynamic threshold: damping per second of audio
+        self.dynamic_damping = dynamic_damping
+        self.energy_threshold = _calibrations.get(device_index)
+        self.idle_timeout = idle_timeout
+        self._subscribers: List[Callable] = []
+        self._error_handlers: List[Callable] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self._data_ready = threading.Event()
+        self._idle_since: Optional[float] = None
+
+    def subscribe(self, on_audio: Callable[[Utterance], None],
+                  on_error: Optional[Callable[[str], None]] = None):
+        """Start receiving utterances; callbacks run on the capture thread and must not block."""
+        with self._lock:
+            self._subscribers.append(on_audio)
+            if on_error:
+                self._error_handlers.append(on_error)
+            self._idle_since = None
+            if self._thread is None or not self._thread.is_alive():
+                self._closed.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name=f"audio-capture-{self.device_index}", daemon=True
+                )
+                self._thread.start()
+
+    def unsubscribe(self, on_audio: Callable, on_error: Optional[Callable] = None):
+        with self._lock:
+            if on_audio in self._subscribers:
+                self._subscribers.remove(on_audio)
+            if on_error in self._error_handlers:
+                self._error_handlers.remove(on_error)
+            if not self._subscribers:
+                self._idle_since = time.monotonic()
+
+    def close(self):
+        self._closed.set()
+        self._data_ready.set()
+
+    def _open_stream(self) -> sd.InputStream:
+        info = sd.query_devices(self.device_index, "input")
+        channels = max(1, min(2, int(info["max_input_channels"])))
+        try:
+            sd.check_input_settings(device=self.device_index, channels=channels, samplerate=self.sample_rate)
+            device_rate = self.sample_rate
+        except Exception:
+            device_rate = int(info["default_samplerate"])
+        resample = LinearResampler(device_rate, self.sample_rate) if device_rate != self.sample_rate else None
+
+        def callback(indata, frames, time_info, status):
+            mono = indata.mean(axis=1) if indata.shape[1] > 1 else indata[:, 0]
+            self.ring.write(resample(mono) if resample else mono)
+            self._data_ready.set()
+
+        return sd.InputStream(device=self.device_index, channels=channels, samplerate=device_rate,
+                              dtype="float32", callback=callback)
+
+    def _run(self):
+        try:
+            with self._open_stream():
+                self._detect_utterances()
+        except Exception as e:
+            print(f"[AudioCapture] device {self.device_index} failed: {e}")
+            with self._lock:
+                handlers = list(self._error_handlers)
+            for on_error in handlers:
+                on_error(str(e))
+
+    def _detect_utterances(self):
+        frame_len, rate = self.frame_len, self.sample_rate
+        frame_seconds = frame_len / rate
+        damping = self.dynamic_damping ** frame_seconds
+        pause_frames = int(self.pause_threshold / frame_seconds)
+        max_samples = int(self.phrase_time_limit * rate) if self.phrase_time_limit else None
+        pre_roll = int(self.pre_roll_seconds * rate)
+        calibration_rms: List[np.ndarray] = []
+        position = self.ring.written
+        speech_start = None
+        silent_frames = 0
+
+        while not self._closed.is_set() and not self._idle_expired():
+            self._data_ready.wait(timeout=0.5)
+            self._data_ready.clear()
+            if position < self.ring.oldest:
+                # Fell a whole ring behind; skip ahead rather than read overwritten samples
+                position, speech_start = self.ring.written, None
+            count = (self.ring.written - position) // frame_len
+            if count == 0:
+                continue
+            frames = self.ring.view(position, position + count * frame_len).reshape(count, frame_len)
+            rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame_len)
+
+            if self.energy_threshold is None:
+                calibration_rms.append(rms)
+                if sum(len(r) for r in calibration_rms) * frame_seconds >= self.calibration_seconds:
+                    self._set_threshold(float(np.concatenate(calibration_rms).mean()) * self.energy_ratio)
+                position += count * frame_len
+                continue
+
+            for level in rms:
+                position += frame_len
+                if speech_start is None:
+                    if level > self.energy_threshold:
+                        speech_start = max(position - frame_len - pre_roll, self.ring.oldest)
+                        silent_frames = 0
+                    else:
+                        self._set_threshold(damping * self.energy_threshold +
+                                            (1 - damping) * float(level) * self.energy_ratio)
+                    continue
+                silent_frames = silent_frames + 1 if level <= self.energy_threshold else 0
+                too_long = max_samples is not None and position - speech_start >= max_samples
+                if silent_frames >= pause_frames or too_long:
+                    end = position - silent_frames * frame_len if not too_long else position
+                    if (end - speech_start) / rate >= self.min_phrase_seconds + self.pre_roll_seconds:
+                        # One owned copy per utterance: recognition is queued and may outlive the ring window
+                        self._dispatch(Utterance(self.ring.read(speech_start, end), rate))
+                    speech_start = None
+
+    def _set_threshold(self, value: float):
+        self.energy_threshold = max(value, self.min_energy_threshold)
+        _calibrations[self.device_index] = self.energy_threshold
+
+    def _dispatch(self, utterance: Utterance):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for on_audio in subscribers:
+            on_audio(utterance)
+
+    def _idle_expired(self) -> bool:
+        with self._lock:
+            if self._subscribers or self._idle_since is None:
+                return False
+            if time.monotonic() - self._idle_since < self.idle_timeout:
+                return False
+            # Clear the thread under the lock so a concurrent subscribe() starts a fresh one
+            self._thread = None
+            return True
+
+
+_captures: Dict[Optional[int], AudioCapture] = {}
+_captures_lock = threading.Lock()
+
+
+def get_capture(device_index: Optional[int] = None) -> AudioCapture:
+    """Shared capture service for an input device; every page listening on it gets the same stream."""
+    with _captures_lock:
+        if device_index not in _captures:
+            _captures[device_index] = AudioCapture(device_index)
+        return _captures[device_index]
+
+
+def close_all():
+    with _captures_lock:
+        for capture in _captures.values():
+            capture.close()
+        _captures.clear()
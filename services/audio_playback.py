@@ -0,0 +1,146 @@
+# services/audio_playback.py
+
+import collections
+import threading
+from typing import Deque, Dict, Optional
+
+import numpy as np
+import sounddevice as sd
+
+from services.audio_capture import LinearResampler
+
+DEFAULT_PLAYBACK_RATE = 24000  # gTTS output rate, so speech normally plays without resampling
+
+
+class PlaybackHandle:
+    """Completion notification for one queued buffer. `completed` is False if it was flushed by stop()."""
+    def __init__(self):
+        self._done = threading.Event()
+        self.completed = False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def _finish(self, completed: bool):
+        self.completed = completed
+        self._done.set()
+
+
+class _Buffer:
+    def __init__(self, samples: np.ndarray, handle: PlaybackHandle):
+        self.samples = samples
+        self.position = 0
+        self.handle = handle
+
+
+class AudioPlayback:
+    """
+    Long-lived output stream for one device. Buffers are queued and the stream callback plays
+    them back to back, so consecutive sentences are gapless; with nothing queued it outputs
+    silence instead of closing the device. stop() flushes everything immediately.
+    """
+    def __init__(self, device_index: Optional[int] = None, sample_rate: int = DEFAULT_PLAYBACK_RATE,
+                 channels: int = 1):
+        self.device_index = device_index
+        self.channels = channels
+        try:
+            sd.check_output_settings(device=device_index, channels=channels, samplerate=sample_rate)
+            self.sample_rate = sample_rate
+        except Exception:
+            self.sample_rate = int(sd.query_devices(device_index, "output")["default_samplerate"])
+        self._queue: Deque[_Buffer] = collections.deque()
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stream = sd.OutputStream(device=device_index, channels=channels, samplerate=self.sample_rate,
+                                       dtype="float32", callback=self._callback)
+        self._stream.start()
+
+    @property
+    def device_name(self) -> Optional[str]:
+        return device_name(self.device_index)
+
+    def enqueue(self, samples: np.ndarray, sample_rate: int) -> PlaybackHandle:
+        """Queue mono int16 or float32 samples; returns immediately with a completion handle."""
+        if samples.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+        if sample_rate != self.sample_rate:
+            samples = LinearResampler(sample_rate, self.sample_rate)(samples)
+        handle = PlaybackHandle()
+        with self._lock:
+            self._queue.append(_Buffer(samples.astype(np.float32, copy=False), handle))
+            self._idle.clear()
+        return handle
+
+    def stop(self):
+        """Cut the current buffer and drop everything queued behind it."""
+        with self._lock:
+            flushed = list(self._queue)
+            self._queue.clear()
+            self._idle.set()
+        for buffer in flushed:
+            buffer.handle._finish(False)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        return self._idle.wait(timeout)
+
+    def close(self):
+        self.stop()
+        self._stream.close()
+
+    def _callback(self, outdata, frames, time_info, status):
+        filled = 0
+        finished = []
+        with self._lock:
+            while filled < frames and self._queue:
+                buffer = self._queue[0]
+                take = min(frames - filled, len(buffer.samples) - buffer.position)
+                outdata[filled:filled + take, :] = buffer.samples[buffer.position:buffer.position + take, None]
+                buffer.position += take
+                filled += take
+                if buffer.position >= len(buffer.samples):
+                    finished.append(self._queue.popleft().handle)
+            if not self._queue:
+                self._idle.set()
+        outdata[filled:] = 0
+        for handle in finished:
+            handle._finish(True)
+
+
+_device_names: Dict[Optional[int], Optional[str]] = {}
+
+
+def device_name(device_index: Optional[int]) -> Optional[str]:
+    """Cached sounddevice name lookup; query_devices is slow enough to notice per sentence."""
+    if device_index is None:
+        return None
+    if device_index not in _device_names:
+        try:
+            _device_names[device_index] = sd.query_devices(device_index)["name"]
+        except Exception as e:
+            print(f"⚠️ Failed to get speaker name: {e}")
+            return None
+    return _device_names[device_index]
+
+
+_players: Dict[Optional[int], AudioPlayback] = {}
+_players_lock = threading.Lock()
+
+
+def get_playback(device_index: Optional[int] = None) -> AudioPlayback:
+    """Shared playback service for an output device, opened on first use and kept open."""
+    with _players_lock:
+        if device_index not in _players:
+            _players[device_index] = AudioPlayback(device_index)
+        return _players[device_index]
+
+
+def close_all():
+    with _players_lock:
+        for player in _players.values():
+            player.close()
+        _players.clear()
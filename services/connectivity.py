@@ -0,0 +1,115 @@
+# services/connectivity.py
+
+import socket
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class ConnectivityMonitor:
+    """
+    Online/offline state probed on a background thread, so callers choosing between cloud and
+    local backends get a cached answer instead of a socket round-trip. The probe reruns every
+    `interval` seconds (`offline_interval` while offline), and immediately when a caller reports
+    a network failure. Subscribers are told whenever the state flips.
+    The probe's answer is only a hint: while it says offline, should_try() still lets one real
+    request through every `offline_interval` seconds, so a network that blocks the probe address
+    but not the service is noticed as soon as that request succeeds.
+    """
+    def __init__(self, probe_address: Tuple[str, int] = ("8.8.8.8", 53), timeout: float = 2,
+                 interval: float = 30, offline_interval: float = 5):
+        self.probe_address = probe_address
+        self.timeout = timeout
+        self.interval = interval
+        self.offline_interval = offline_interval
+        # Optimistic until the first probe finishes: a cloud call that fails reports back anyway
+        self._online = True
+        self.last_checked: Optional[float] = None
+        self._listeners: List[Callable[[bool], None]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._last_offline_try = 0.0
+        self._thread = threading.Thread(target=self._run, name="connectivity", daemon=True)
+        self._thread.start()
+
+    def is_online(self) -> bool:
+        return self._online
+
+    def should_try(self) -> bool:
+        """Whether a caller should attempt a network request now (online, or due an offline retry)."""
+        if self._online:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_offline_try < self.offline_interval:
+                return False
+            self._last_offline_try = now
+            return True
+
+    def subscribe(self, listener: Callable[[bool], None]):
+        """`listener(online)` is called from the monitor thread on every change."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[bool], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def report_failure(self):
+        """A network call failed: re-probe now rather than at the next scheduled check."""
+        # A burst of failing calls shouldn't turn into a burst of probes
+        if self.last_checked is None or time.monotonic() - self.last_checked >= 1:
+            self._wake.set()
+
+    def report_success(self):
+        """A network call succeeded, which is as good as a probe."""
+        self._set_online(True)
+
+    def refresh(self) -> bool:
+        """Probe synchronously and return the new state."""
+        try:
+            socket.create_connection(self.probe_address, timeout=self.timeout).close()
+            online = True
+        except OSError:
+            online = False
+        self.last_checked = time.monotonic()
+        self._set_online(online)
+        return online
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+
+    def _set_online(self, online: bool):
+        with self._lock:
+            changed = online != self._online
+            self._online = online
+            listeners = list(self._listeners) if changed else []
+        if changed:
+            print(f"[ConnectivityMonitor] {'online' if online else 'offline'}")
+        for listener in listeners:
+            try:
+                listener(online)
+            except Exception as e:
+                print(f"[ConnectivityMonitor] listener failed: {e}")
+
+    def _run(self):
+        while not self._closed:
+            self.refresh()
+            self._wake.wait(self.interval if self._online else self.offline_interval)
+            self._wake.clear()
+
+
+_monitor: Optional[ConnectivityMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> ConnectivityMonitor:
+    """The process-wide monitor shared by TTS, translation and speech recognition."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ConnectivityMonitor()
+        return _monitor
@@ -0,0 +1,172 @@
+# services/model_registry.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class ModelUnavailable(Exception):
+    """Raised when a model can't be loaded (missing from the hub, no network, out of budget...)."""
+
+
+class _Entry:
+    def __init__(self, value: Tuple[Any, Any], size: int):
+        self.value = value
+        self.size = size
+        self.refs = 0
+
+
+def _tensor_bytes(value: Any, seen: set) -> int:
+    # Tensors, or the tuples/lists quantized modules pack theirs into; shared storage counts once
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(v, seen) for v in value)
+    try:
+        key = (value.data_ptr(), value.numel())
+        if key in seen:
+            return 0
+        seen.add(key)
+        return value.numel() * value.element_size()
+    except (AttributeError, RuntimeError):
+        return 0
+
+
+def _dir_size_bytes(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def model_size_bytes(model: Any) -> int:
+    """
+    Approximate resident bytes of a loaded model. Torch modules are measured by their parameters,
+    buffers and state_dict() (dynamically quantized Linear layers keep their int8 weights in packed
+    params that only show up there); onnxruntime models by the size of their ONNX export on disk.
+    0 if the model is neither.
+    """
+    if hasattr(model, "state_dict"):
+        seen: set = set()
+        tensors = list(model.parameters()) + list(model.buffers()) if hasattr(model, "parameters") else []
+        return _tensor_bytes(tensors, seen) + _tensor_bytes(list(model.state_dict().values()), seen)
+    save_dir = getattr(model, "model_save_dir", None)
+    if save_dir is not None and os.path.isdir(str(save_dir)):
+        return _dir_size_bytes(str(save_dir))
+    return 0
+
+
+class ModelRegistry:
+    """
+    Keeps loaded (tokenizer, model) pairs within a memory budget.
+    Models are evicted least-recently-used first, but never while an `acquire()` holds them,
+    so an in-flight generate() can't lose its weights. Budget 0/None means unbounded.
+    Failed loads are remembered for `retry_missing_after` seconds before being attempted again.
+    """
+    def __init__(self, loader: Callable[[Hashable], Tuple[Any, Any]], memory_budget: Optional[int] = None,
+                 sizer: Callable[[Any], int] = model_size_bytes, retry_missing_after: float = 300):
+        self.loader = loader
+        self.memory_budget = memory_budget
+        self.sizer = sizer
+        self.retry_missing_after = retry_missing_after
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._missing: Dict[Hashable, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+
+    def is_resident(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def is_missing(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._missing_reason(key) is not None
+
+    def _missing_reason(self, key: Hashable) -> Optional[str]:
+        # Caller holds self._lock
+        missing = self._missing.get(key)
+        if missing is None:
+            return None
+        if time.monotonic() - missing[1] > self.retry_missing_after:
+            del self._missing[key]
+            return None
+        return missing[0]
+
+    def load(self, key: Hashable) -> Tuple[Any, Any]:
+        """Make sure `key` is resident and return it (without holding a reference)."""
+        with self.acquire(key) as value:
+            return value
+
+    @contextmanager
+    def acquire(self, key: Hashable) -> Iterator[Tuple[Any, Any]]:
+        """Hold a model for the duration of the block; it can't be evicted meanwhile."""
+        entry = self._get_or_load(key)
+        try:
+            yield entry.value
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                self._evict_over_budget()
+
+    def _get_or_load(self, key: Hashable) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self._entries.move_to_end(key)
+                return entry
+            reason = self._missing_reason(key)
+            if reason is not None:
+                raise ModelUnavailable(reason)
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # One loader per key; concurrent callers wait for it instead of loading twice
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refs += 1
+                    self._entries.move_to_end(key)
+                    return entry
+            try:
+                value = self.loader(key)
+            except Exception as e:
+                with self._lock:
+                    self._missing[key] = (str(e), time.monotonic())
+                raise ModelUnavailable(str(e)) from e
+
+            entry = _Entry(value, self.sizer(value[1]))
+            with self._lock:
+                entry.refs += 1
+                self._entries[key] = entry
+                self._evict_over_budget()
+            return entry
+
+    def _evict_over_budget(self):
+        # Caller holds self._lock
+        if not self.memory_budget:
+            return
+        for key in list(self._entries):
+            if self.resident_bytes_total() <= self.memory_budget:
+                break
+            if self._entries[key].refs == 0:
+                print(f"[ModelRegistry] Evicting {key} ({self._entries[key].size / 2**20:.0f} MB)")
+                del self._entries[key]
+
+    def resident_bytes_total(self) -> int:
+        return sum(e.size for e in self._entries.values())
+
+    def resident(self) -> Dict[Hashable, int]:
+        """Resident bytes per model, least recently used first."""
+        with self._lock:
+            return {key: e.size for key, e in self._entries.items()}
+
+    def forget_missing(self):
+        """Allow previously failed models to be retried (e.g. after connectivity returns)."""
+        with self._lock:
+            self._missing.clear()
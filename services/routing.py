@@ -0,0 +1,186 @@
+# services/routing.py
+
+import difflib
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+MAX_QUALITY = "max_quality"
+ADAPTIVE = "adaptive"
+
+
+class BackendStats:
+    """Rolling latency, failure and (for LLaMA) agreement samples for one backend and language pair."""
+    def __init__(self, window: int = 100, outcome_window: int = 20):
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=outcome_window)
+        self.agreements: deque = deque(maxlen=window)
+        self.last_attempt = 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    @property
+    def agreement_rate(self) -> Optional[float]:
+        if not self.agreements:
+            return None
+        return sum(self.agreements) / len(self.agreements)
+
+
+class RoutePlan:
+    """Which candidate backends a chunk group runs, in preference order, and when the hedge starts."""
+    def __init__(self, candidates: List[str], hedge_after: Optional[float] = None):
+        self.candidates = candidates
+        # None: start every candidate at once. Otherwise candidates[1:] start only if the
+        # primary hasn't produced a usable result after this many seconds.
+        self.hedge_after = hedge_after
+
+    def __repr__(self):
+        return f"RoutePlan(candidates={self.candidates}, hedge_after={self.hedge_after})"
+
+
+class RoutingPolicy:
+    """
+    Decides per chunk group which backends to run, based on live per-backend, per-language-pair
+    statistics.
+
+    max_quality: the full ensemble, i.e. every candidate backend runs and LLaMA arbitrates.
+    adaptive: the fastest healthy backend runs first, and a second backend is hedged in only if
+    the first misses its p95 latency deadline. Every backend runs while stats warm up, and on a
+    small `explore_rate` share of groups afterwards. Backends that keep failing are skipped, apart from
+    an occasional probe. LLaMA is skipped when the candidates already agree, when there is only
+    one candidate, or (outside the same `explore_rate` share) when it nearly always picks the first
+    candidate anyway.
+    """
+    def __init__(self, mode: str = ADAPTIVE, candidate_backends: Tuple[str, ...] = ("google", "marian"),
+                 default_hedge_after: float = 2.0, min_hedge_after: float = 0.3, min_samples: int = 10,
+                 max_failure_rate: float = 0.5, probe_interval: float = 60,
+                 agreement_threshold: float = 0.9, skip_llama_agreement_rate: float = 0.9,
+                 explore_rate: float = 0.1):
+        self.mode = mode
+        self.candidate_backends = candidate_backends
+        self.default_hedge_after = default_hedge_after
+        self.min_hedge_after = min_hedge_after
+        self.min_samples = min_samples
+        self.max_failure_rate = max_failure_rate
+        self.probe_interval = probe_interval
+        self.agreement_threshold = agreement_threshold
+        self.skip_llama_agreement_rate = skip_llama_agreement_rate
+        # Share of adaptive plans that run every healthy backend anyway, keeping all stats fresh
+        self.explore_rate = explore_rate
+        self._stats: Dict[Tuple[str, str, str], BackendStats] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, backend: str, src_lang: str, dest_lang: str) -> BackendStats:
+        key = (backend, src_lang, dest_lang)
+        with self._lock:
+            if key not in self._stats:
+                self._stats[key] = BackendStats()
+            return self._stats[key]
+
+    def record(self, backend: str, src_lang: str, dest_lang: str, latency: float, ok: bool):
+        stats = self.stats(backend, src_lang, dest_lang)
+        with self._lock:
+            stats.last_attempt = time.monotonic()
+            stats.outcomes.append(ok)
+            if ok:
+                stats.latencies.append(latency)
+
+    def record_llama_choice(self, src_lang: str, dest_lang: str, chosen: Optional[str], candidates: List[str]):
+        """Track whether LLaMA picked what we would have used without it (the first candidate)."""
+        if not chosen or not candidates:
+            return
+        stats = self.stats("llama", src_lang, dest_lang)
+        with self._lock:
+            stats.agreements.append(chosen.strip() == candidates[0].strip())
+
+    def is_healthy(self, backend: str, src_lang: str, dest_lang: str) -> bool:
+        stats = self.stats(backend, src_lang, dest_lang)
+        with self._lock:
+            if len(stats.outcomes) < 3 or stats.failure_rate <= self.max_failure_rate:
+                return True
+            # Let one probe through now and then so a recovered backend gets back in rotation
+            now = time.monotonic()
+            if now - stats.last_attempt >= self.probe_interval:
+                stats.last_attempt = now
+                return True
+            return False
+
+    def plan(self, src_lang: str, dest_lang: str) -> RoutePlan:
+        if self.mode == MAX_QUALITY:
+            return RoutePlan(list(self.candidate_backends))
+
+        healthy = [b for b in self.candidate_backends if self.is_healthy(b, src_lang, dest_lang)]
+        if not healthy:
+            healthy = list(self.candidate_backends)
+
+        def median_latency(backend: str) -> float:
+            p50 = self.stats(backend, src_lang, dest_lang).percentile(0.5)
+            return p50 if p50 is not None else float("inf")
+
+        ordered = sorted(healthy, key=median_latency)  # stable: unknown latencies keep default order
+        if len(ordered) == 1:
+            return RoutePlan(ordered)
+
+        # Until every backend has enough samples (and now and then afterwards), run them all
+        warming_up = any(len(self.stats(b, src_lang, dest_lang).latencies) < self.min_samples for b in ordered)
+        if warming_up or random.random() < self.explore_rate:
+            return RoutePlan(ordered)
+
+        primary = self.stats(ordered[0], src_lang, dest_lang)
+        p95 = primary.percentile(0.95) if len(primary.latencies) >= self.min_samples else None
+        hedge_after = max(self.min_hedge_after, p95) if p95 is not None else self.default_hedge_after
+        return RoutePlan(ordered, hedge_after=hedge_after)
+
+    def candidates_agree(self, candidates: List[str]) -> bool:
+        if len(candidates) < 2:
+            return False
+        normalized = [" ".join(c.lower().split()) for c in candidates]
+        return all(
+            difflib.SequenceMatcher(None, normalized[0], other).ratio() >= self.agreement_threshold
+            for other in normalized[1:]
+        )
+
+    def should_arbitrate(self, src_lang: str, dest_lang: str, candidates: List[str]) -> bool:
+        """Whether LLaMA should choose between these candidates."""
+        if not candidates:
+            return False
+        if self.mode == MAX_QUALITY:
+            return True
+        if len(candidates) < 2 or self.candidates_agree(candidates):
+            return False
+        if not self.is_healthy("llama", src_lang, dest_lang):
+            return False
+        stats = self.stats("llama", src_lang, dest_lang)
+        rate = stats.agreement_rate
+        if rate is not None and len(stats.agreements) >= self.min_samples and rate >= self.skip_llama_agreement_rate:
+            # Still arbitrate an `explore_rate` share, so the agreement rate keeps getting samples
+            # and the skip lifts once LLaMA starts disagreeing again
+            return random.random() < self.explore_rate
+        return True
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], Dict[str, Optional[float]]]:
+        """p50/p95 latency, failure rate and LLaMA agreement per (backend, src, dest)."""
+        with self._lock:
+            items = list(self._stats.items())
+        return {
+            key: {
+                "p50": s.percentile(0.5),
+                "p95": s.percentile(0.95),
+                "failure_rate": s.failure_rate,
+                "agreement_rate": s.agreement_rate,
+                "samples": len(s.outcomes),
+            }
+            for key, s in items
+        }
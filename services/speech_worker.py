@@ -2,7 +2,16 @@
 
 from PyQt6.QtCore import QObject, pyqtSignal
 import speech_recognition as sr
+import importlib.util
 import threading
+import queue
+import itertools
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from services.audio_capture import AudioCapture, LinearResampler, TARGET_SAMPLE_RATE, Utterance, get_capture
+from services.connectivity import ConnectivityMonitor, get_monitor
 
 LANGUAGE_CODE_MAP = {
     "en": "en-US",
@@ -10,56 +19,265 @@ LANGUAGE_CODE_MAP = {
     "ur": "ur-PK"
 }
 
+# Per-language recognizer choice: "local" tries the on-device model first, "cloud" uses only
+# Google, "auto" uses Google while it is reachable and the local model when it isn't.
+RECOGNIZER_PREFERENCES = {
+    "en": "local",
+    "ar": "auto",
+    "ur": "auto"
+}
+
+
+class RecognizerBackend(ABC):
+    """Turns a captured utterance into text. Raises sr.UnknownValueError / sr.RequestError like speech_recognition."""
+    @abstractmethod
+    def recognize(self, audio: Utterance, lang_code: str) -> str:
+        pass
+
+    def available(self) -> bool:
+        return True
+
+    def warm_up(self):
+        pass
+
+    @property
+    def name(self):
+        return self.__class__.__name__
+
+
+class GoogleRecognizer(RecognizerBackend):
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio: Utterance, lang_code: str) -> str:
+        return self.recognizer.recognize_google(audio.audio_data(), language=lang_code)
+
+
+class LocalWhisperRecognizer(RecognizerBackend):
+    """
+    Offline recognition with faster-whisper on the CPU (optional dependency). The model is
+    loaded once per process, int8-quantized by default, and kept warm between utterances.
+    """
+    _models: Dict[tuple, object] = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, model_size: str = "small", compute_type: str = "int8", cpu_threads: int = 0,
+                 beam_size: int = 1):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.beam_size = beam_size
+
+    def available(self) -> bool:
+        return importlib.util.find_spec("faster_whisper") is not None
+
+    def _model(self):
+        key = (self.model_size, self.compute_type, self.cpu_threads)
+        with self._models_lock:
+            if key not in self._models:
+                from faster_whisper import WhisperModel
+                print(f"[LocalWhisperRecognizer] Loading whisper-{self.model_size} ({self.compute_type})")
+                self._models[key] = WhisperModel(
+                    self.model_size, device="cpu", compute_type=self.compute_type, cpu_threads=self.cpu_threads
+                )
+            return self._models[key]
+
+    def warm_up(self):
+        if self.available():
+            threading.Thread(target=self._model, name="whisper-warmup", daemon=True).start()
+
+    def recognize(self, audio: Utterance, lang_code: str) -> str:
+        # The capture ring already produces 16 kHz mono float32, which is what whisper expects
+        samples = audio.samples
+        if audio.sample_rate != TARGET_SAMPLE_RATE:
+            samples = LinearResampler(audio.sample_rate, TARGET_SAMPLE_RATE)(samples)
+        segments, _ = self._model().transcribe(
+            samples, language=lang_code.split("-")[0], beam_size=self.beam_size
+        )
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class RecognizerPolicy:
+    """
+    Picks local vs. cloud recognition per language (see RECOGNIZER_PREFERENCES) and falls back
+    to the other backend on failure. While the shared connectivity monitor reports offline, the
+    local model goes first whenever one is available.
+    """
+    def __init__(self, preferences: Optional[Dict[str, str]] = None, cloud: Optional[RecognizerBackend] = None,
+                 local: Optional[RecognizerBackend] = None, connectivity: Optional[ConnectivityMonitor] = None):
+        self.preferences = dict(RECOGNIZER_PREFERENCES if preferences is None else preferences)
+        self.cloud = cloud or GoogleRecognizer()
+        self.local = local or LocalWhisperRecognizer()
+        self.connectivity = connectivity or get_monitor()
+
+    def backends_for(self, lang_code: str) -> List[RecognizerBackend]:
+        preference = self.preferences.get(lang_code.split("-")[0], "auto")
+        local = [self.local] if self.local.available() else []
+        if preference == "cloud" or not local:
+            return [self.cloud]
+        if preference == "local" or not self.connectivity.should_try():
+            return local + [self.cloud]
+        return [self.cloud] + local
+
+    def warm_up(self, lang_code: str):
+        for backend in self.backends_for(lang_code):
+            backend.warm_up()
+
+    def recognize(self, audio: Utterance, lang_code: str) -> str:
+        last_error: Optional[Exception] = None
+        for backend in self.backends_for(lang_code):
+            try:
+                text = backend.recognize(audio, lang_code)
+            except sr.UnknownValueError:
+                raise
+            except sr.RequestError as e:
+                if backend is self.cloud:
+                    self.connectivity.report_failure()
+                last_error = e
+                continue
+            except Exception as e:
+                print(f"[RecognizerPolicy] {backend.name} failed: {e}")
+                last_error = sr.RequestError(str(e))
+                continue
+            if backend is self.cloud:
+                self.connectivity.report_success()
+            return text
+        raise last_error or sr.RequestError("no recognizer available")
+
+
+_default_policy: Optional[RecognizerPolicy] = None
+
+
+def default_recognizer_policy() -> RecognizerPolicy:
+    """Process-wide policy, so the local model is loaded once and shared by every page."""
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = RecognizerPolicy()
+    return _default_policy
+
+
+class _ListenSession:
+    """State for one start/stop cycle, so a restarted worker never mixes in stale segments."""
+    def __init__(self, max_pending_segments: int, recognizer_workers: int):
+        self.stop_event = threading.Event()
+        self.segments = queue.Queue(maxsize=max_pending_segments)
+        # One slot per recognizer: segments leave the bounded queue only when a worker is free
+        self.slots = threading.BoundedSemaphore(recognizer_workers)
+        self.sequence = itertools.count()
+        self.next_to_emit = 0
+        self.finished = {}
+        self.lock = threading.Lock()
+
 
 class SpeechWorker(QObject):
+    """
+    Continuous speech recognition as a producer/consumer pipeline: the shared capture service
+    for the microphone pushes each utterance into a bounded queue, while a small pool of
+    recognizer workers transcribes them concurrently. Results are emitted in the order they
+    were spoken. A worker can be stopped and started again; the stream stays open in between.
+    """
     result_ready = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, lang_code="en-US", mic_index=None):
+    def __init__(self, lang_code="en-US", mic_index=None, recognizer_workers=2, max_pending_segments=8,
+                 policy: Optional[RecognizerPolicy] = None):
         super().__init__()
         self.lang_code = lang_code
-        self.recognizer = sr.Recognizer()
-        self.recognizer.pause_threshold = 1.0
-        self.recognizer.energy_threshold = 300
         self.mic_index = mic_index
-        self.mic = None
+        self.capture: Optional[AudioCapture] = None
         self.listening = False
-        self._stop_event = threading.Event()
+        self.recognizer_workers = recognizer_workers
+        self.max_pending_segments = max_pending_segments
+        self._session = None
+        self.policy = policy or default_recognizer_policy()
 
     def set_mic_index(self, index: int):
         self.mic_index = index
 
+    def set_lang_code(self, lang_code: str):
+        self.lang_code = lang_code
+
     def start_listening(self):
         if self.listening:
             return
-        try:
-            self.mic = sr.Microphone(device_index=self.mic_index)
-            with self.mic as source:
-                self.recognizer.adjust_for_ambient_noise(source)
-
-            self._stop_event.clear()
-            self.listening = True
-            threading.Thread(target=self._listen_loop, daemon=True).start()
-        except Exception as e:
-            self.error_occurred.emit(f"Mic Init Error: {str(e)}")
+        self.policy.warm_up(self.lang_code)
+        session = self._session = _ListenSession(self.max_pending_segments, self.recognizer_workers)
+        self.listening = True
+        threading.Thread(target=self._dispatch_loop, args=(session,), daemon=True).start()
+        self.capture = get_capture(self.mic_index)
+        self.capture.subscribe(self._on_audio, self._on_capture_error)
 
     def stop_listening(self):
-        self._stop_event.set()
+        if self.capture:
+            self.capture.unsubscribe(self._on_audio, self._on_capture_error)
+            self.capture = None
+        session = self._session
+        if session:
+            session.stop_event.set()
+            try:
+                session.segments.put_nowait(None)
+            except queue.Full:
+                pass  # the dispatcher checks stop_event after every segment
         self.listening = False
 
-    def _listen_loop(self):
-        while not self._stop_event.is_set():
-            try:
-                with self.mic as source:
-                    audio = self.recognizer.listen(source, timeout=5)
-                text = self.recognizer.recognize_google(audio, language=self.lang_code)
-                self.result_ready.emit(text)
-            except sr.WaitTimeoutError:
-                # No speech within timeout — loop to try again
-                continue
-            except sr.UnknownValueError:
-                continue
-            except sr.RequestError as e:
-                self.error_occurred.emit("Network error: " + str(e))
-            except Exception as e:
-                self.error_occurred.emit("Microphone error: " + str(e)) 
\ No newline at end of file
+    def _on_audio(self, audio: Utterance):
+        """Producer side, called on the capture thread: hand the utterance off without waiting."""
+        session = self._session
+        if session and not session.stop_event.is_set():
+            self._enqueue(session, audio)
+
+    def _on_capture_error(self, message: str):
+        self.error_occurred.emit("Microphone error: " + message)
+
+    def _enqueue(self, session: _ListenSession, audio):
+        index = next(session.sequence)
+        try:
+            # Never block: the capture thread is shared with every other listener
+            session.segments.put_nowait((index, audio))
+        except queue.Full:
+            # Recognizers can't keep up; drop rather than stall capture
+            print("[SpeechWorker] recognition backlog full, dropping segment")
+            self._complete(session, index, None)
+
+    def _dispatch_loop(self, session: _ListenSession):
+        """
+        Consumer: feed queued segments to the recognizer pool, one per free recognizer, so the
+        backlog stays in the bounded queue (where _enqueue can drop it) and not in the executor.
+        """
+        with ThreadPoolExecutor(max_workers=self.recognizer_workers, thread_name_prefix="recognizer") as pool:
+            while True:
+                while not session.slots.acquire(timeout=0.5):
+                    if session.stop_event.is_set():
+                        return
+                segment = session.segments.get()
+                if segment is None or session.stop_event.is_set():
+                    session.slots.release()
+                    break
+                pool.submit(self._recognize, session, *segment)
+
+    def _recognize(self, session: _ListenSession, index, audio):
+        text = None
+        try:
+            text = self.policy.recognize(audio, self.lang_code)
+        except sr.UnknownValueError:
+            pass
+        except sr.RequestError as e:
+            self.error_occurred.emit("Network error: " + str(e))
+        except Exception as e:
+            self.error_occurred.emit("Recognition error: " + str(e))
+        finally:
+            session.slots.release()
+            self._complete(session, index, text)
+
+    def _complete(self, session: _ListenSession, index, text):
+        # Re-order: a short utterance may finish recognizing before a longer one spoken earlier
+        with session.lock:
+            session.finished[index] = text
+            while session.next_to_emit in session.finished:
+                ready = session.finished.pop(session.next_to_emit)
+                session.next_to_emit += 1
+                if ready and not session.stop_event.is_set():
+                    self.result_ready.emit(ready)
\ No newline at end of file
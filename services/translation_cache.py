@@ -0,0 +1,229 @@
+# services/translation_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from services.translators import Translator
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_CACHE_DB = os.path.join(DATA_DIR, "translation_cache.sqlite3")
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with optional TTL and hit/miss counters."""
+    def __init__(self, max_entries: int = 2048, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._data)}
+
+
+class SQLiteStore:
+    """
+    On-disk translation store that survives restarts, pruned to `max_rows` oldest-first.
+    put() only queues the row: a writer thread commits queued rows in one transaction every
+    `flush_interval` seconds and prunes once every `prune_every` rows, so callers never pay
+    for disk I/O. Queued rows are visible to get() straight away; close() flushes them.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_DB, max_rows: int = 50000, ttl: Optional[float] = None,
+                 flush_interval: float = 1.0, prune_every: int = 1000):
+        self.path = path
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.prune_every = prune_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._since_prune = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS translations_created ON translations (created)")
+        self._conn.commit()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="translation-cache-writer", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _digest(key: Tuple) -> str:
+        return hashlib.sha256("\x1f".join(map(str, key)).encode("utf-8")).hexdigest()
+
+    def get(self, key: Tuple) -> Optional[str]:
+        digest = self._digest(key)
+        with self._lock:
+            row = self._pending.get(digest)
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT value, created FROM translations WHERE key = ?", (digest,)
+                ).fetchone()
+            if row and (self.ttl is None or time.time() - row[1] <= self.ttl):
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, value: str):
+        with self._lock:
+            self._pending[self._digest(key)] = (value, time.time())
+
+    def flush(self):
+        """Commit queued rows now, pruning if enough have gone in since the last prune."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [(digest, value, created) for digest, (value, created) in self._pending.items()]
+            self._pending.clear()
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO translations (key, value, created) VALUES (?, ?, ?)", rows
+                )
+                self._since_prune += len(rows)
+                if self._since_prune >= self.prune_every:
+                    self._since_prune = 0
+                    # created is indexed, so finding the cutoff doesn't scan the table
+                    self._conn.execute(
+                        "DELETE FROM translations WHERE created < ("
+                        "SELECT created FROM translations ORDER BY created DESC LIMIT 1 OFFSET ?)",
+                        (self.max_rows - 1,)
+                    )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                # The rows are still in the memory tier; losing them on disk only costs a re-translation
+                self._conn.rollback()
+                print(f"[SQLiteStore] write failed, dropped {len(rows)} rows: {e}")
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "pending": len(self._pending)}
+
+    def close(self):
+        self._closed.set()
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationCache:
+    """Two-tier cache: in-memory LRU first, then the optional on-disk store (hits are promoted)."""
+    def __init__(self, memory: Optional[LRUCache] = None, disk: Optional[SQLiteStore] = None):
+        self.memory = memory or LRUCache()
+        self.disk = disk
+
+    @staticmethod
+    def make_key(text: str, src_lang: str, dest_lang: str, backend: str, *extra) -> Tuple:
+        return (text, src_lang, dest_lang, backend) + tuple(extra)
+
+    def get(self, key: Tuple) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                # A broken disk tier is a cache miss, never a failed translation
+                print(f"[TranslationCache] disk read failed, using memory only: {e}")
+                return None
+            if value is not None:
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key: Tuple, value: Optional[str]):
+        # Failures are never cached, so a transient outage doesn't stick
+        if not value or "❌" in value:
+            return
+        self.memory.put(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, value)
+            except sqlite3.Error as e:
+                print(f"[TranslationCache] disk write failed, using memory only: {e}")
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+class CachedTranslator(Translator):
+    """Wraps a backend so identical (text, src, dest, backend) requests skip the backend entirely."""
+    def __init__(self, inner: Translator, cache: TranslationCache):
+        self.inner = inner
+        self.cache = cache
+
+    @property
+    def name(self):
+        return self.inner.name
+
+    def translate(self, text: str, src_lang: str, dest_lang: str, *args, **kwargs) -> Optional[str]:
+        extra = tuple(args) + tuple(sorted(kwargs.items()))
+        key = TranslationCache.make_key(text, src_lang, dest_lang, self.inner.name, repr(extra) if extra else "")
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self.inner.translate(text, src_lang, dest_lang, *args, **kwargs)
+        self.cache.put(key, result)
+        return result
+
+    def translate_batch(self, texts: List[str], src_lang: str, dest_lang: str) -> List[Optional[str]]:
+        """Batch form of translate(): only segments missing from the cache go to the backend's translate_batch."""
+        keys = [TranslationCache.make_key(t, src_lang, dest_lang, self.inner.name, "") for t in texts]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fetched = self.inner.translate_batch([texts[i] for i in missing], src_lang, dest_lang)
+            for i, result in zip(missing, fetched):
+                results[i] = result
+                self.cache.put(keys[i], result)
+        return results
+
+    def __getattr__(self, item):
+        # Backend-specific helpers (e.g. MarianTranslator.translate_batch) pass straight through
+        return getattr(self.inner, item)
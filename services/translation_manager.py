@@ -1,24 +1,278 @@
 # services/translation_manager.py
 
 import threading
+import time
 import re
-from typing import Optional, Callable, List, Dict
-from services.translators import Translator, MarianTranslator, GoogleTranslator, LlamaTranslator
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, wait as wait_futures
+from typing import Optional, Callable, List, Dict, Iterator, Tuple
+from services.translators import Translator, MarianTranslator, GoogleTranslator, LlamaTranslator, MarianInferenceConfig
+from services.worker_pools import WorkerPools
+from services.routing import RoutingPolicy, ADAPTIVE, MAX_QUALITY
+from services.translation_cache import TranslationCache, CachedTranslator, LRUCache, SQLiteStore, DEFAULT_CACHE_DB
+
+
+class TranslationCancelled(Exception):
+    """Raised out of a translate call whose `cancelled` check returned True."""
+
+
+class CandidateArbiter:
+    """
+    Collects the Google/Marian candidates for one chunk group and wakes the LLaMA
+    stage as soon as a quorum of usable candidates is in, or every candidate
+    translator has reported back (including failures, which report None).
+    """
+    def __init__(self, source_text: str, expected: List[str], quorum: int = 1,
+                 on_ready: Optional[Callable[[List[str]], None]] = None):
+        self.source_text = source_text
+        self.expected = list(expected)
+        self.quorum = max(1, min(quorum, len(self.expected)))
+        self._results: Dict[str, Optional[str]] = {}
+        self._cond = threading.Condition()
+        self._on_ready = on_ready
+        self._fired = False
+        self._on_candidate: List[Callable[[str], None]] = []
+
+    def submit(self, name: str, result: Optional[str]):
+        fire = False
+        with self._cond:
+            self._results[name] = result
+            self._cond.notify_all()
+            if self._on_ready and not self._fired and self._ready():
+                self._fired = fire = True
+            candidates = self.candidates()
+            first_listeners, self._on_candidate = (self._on_candidate, []) if candidates else ([], self._on_candidate)
+        for listener in first_listeners:
+            listener(candidates[0])
+        if fire:
+            self._on_ready(candidates)
+
+    def on_first_candidate(self, listener: Callable[[str], None]):
+        """Call `listener(candidate)` once, as soon as any usable candidate is in (now, if one already is)."""
+        with self._cond:
+            candidates = self.candidates()
+            if not candidates:
+                self._on_candidate.append(listener)
+                return
+        listener(candidates[0])
+
+    def lower_quorum(self, quorum: int):
+        """Settle for fewer candidates from now on, firing on_ready at once if that is already met."""
+        fire = False
+        with self._cond:
+            self.quorum = max(1, min(quorum, self.quorum))
+            self._cond.notify_all()
+            if self._on_ready and not self._fired and self._ready():
+                self._fired = fire = True
+        if fire:
+            self._on_ready(self.candidates())
+
+    def results(self) -> Dict[str, Optional[str]]:
+        with self._cond:
+            return {name: self._results.get(name) for name in self.expected}
+
+    def candidates(self) -> List[str]:
+        """Usable candidates in preference order (the order of `expected`)."""
+        source = self.source_text.strip().lower()
+        with self._cond:
+            return [
+                r for r in (self._results.get(name) for name in self.expected)
+                if r and r.strip().lower() != source
+            ]
+
+    def _ready(self) -> bool:
+        return len(self.candidates()) >= self.quorum or len(self._results) >= len(self.expected)
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Block until the quorum is met or all translators are done, then return the candidates."""
+        with self._cond:
+            self._cond.wait_for(self._ready, timeout)
+        return self.candidates()
+
+
+class ArbitrationBatcher:
+    """
+    Packs the LLaMA arbitration of several ready chunk groups into one select_batch() prompt.
+    The pipeline announces each group it starts with expect() and each group that won't need
+    LLaMA with skip(). A language pair's batch goes out as soon as no announced group is still
+    outstanding, when it reaches `max_batch_size`, or `window` seconds after its first item,
+    whichever comes first, so nothing ever waits on a group that isn't coming.
+    """
+    def __init__(self, llama: LlamaTranslator, window: float = 0.5, max_batch_size: int = 8):
+        self.llama = llama
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._cond = threading.Condition()
+        # (src, dest) -> queued (text, candidates, future), when the oldest was queued, groups still to arrive
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, List[str], Future]]] = {}
+        self._first_at: Dict[Tuple[str, str], float] = {}
+        self._expected: Dict[Tuple[str, str], int] = {}
+        self._thread = threading.Thread(target=self._run, name="llama-batcher", daemon=True)
+        self._thread.start()
+
+    def expect(self, src_lang: str, dest_lang: str):
+        """A group for this pair was started and will either submit() or skip()."""
+        with self._cond:
+            pair = (src_lang, dest_lang)
+            self._expected[pair] = self._expected.get(pair, 0) + 1
+
+    def skip(self, src_lang: str, dest_lang: str):
+        """An expected group finished without needing arbitration."""
+        with self._cond:
+            self._arrived_locked((src_lang, dest_lang))
+            self._cond.notify()
+
+    def submit(self, text: str, candidates: List[str], src_lang: str, dest_lang: str) -> Future:
+        future: Future = Future()
+        pair = (src_lang, dest_lang)
+        with self._cond:
+            self._arrived_locked(pair)
+            items = self._pending.setdefault(pair, [])
+            if not items:
+                self._first_at[pair] = time.monotonic()
+            items.append((text, candidates, future))
+            self._cond.notify()
+        return future
+
+    def _arrived_locked(self, pair: Tuple[str, str]):
+        remaining = self._expected.get(pair, 0) - 1
+        if remaining > 0:
+            self._expected[pair] = remaining
+        else:
+            self._expected.pop(pair, None)
+
+    def _next_batch(self) -> Tuple[Tuple[str, str], list]:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = None
+                for pair, items in self._pending.items():
+                    due = self._first_at[pair] + self.window
+                    if len(items) >= self.max_batch_size or pair not in self._expected or now >= due:
+                        batch, rest = items[:self.max_batch_size], items[self.max_batch_size:]
+                        if rest:
+                            # Overflow has already waited as long as the batch ahead of it
+                            self._pending[pair] = rest
+                        else:
+                            del self._pending[pair]
+                            del self._first_at[pair]
+                        return pair, batch
+                    wait = due - now if wait is None else min(wait, due - now)
+                self._cond.wait(wait)
+
+    def _run(self):
+        while True:
+            (src, tgt), items = self._next_batch()
+            try:
+                selected = self.llama.select_batch([(t, c) for t, c, _ in items], src, tgt)
+                for (_, _, future), result in zip(items, selected):
+                    future.set_result(result)
+            except Exception as e:
+                for _, _, future in items:
+                    future.set_exception(e)
+
+
+class _GroupJob:
+    """One chunk group moving through the Google/Marian -> LLaMA pipeline."""
+    def __init__(self, text: str, arbiter: CandidateArbiter):
+        self.text = text
+        self.arbiter = arbiter
+        self.future: Future = Future()
 
 
 class TranslationManager:
-    def __init__(self):
-        self.google: Optional[GoogleTranslator] = None
-        self.marian: Optional[MarianTranslator] = None
-        self.llama: Optional[LlamaTranslator] = None
+    def __init__(self, llama_quorum: int = 1, candidate_timeout: float = 30, max_groups_in_flight: int = 4,
+                 pool_sizes: Optional[Dict[str, tuple]] = None, cache_path: Optional[str] = DEFAULT_CACHE_DB,
+                 cache_ttl: Optional[float] = 7 * 24 * 3600, llama_batch_size: int = 8,
+                 llama_batch_window: float = 0.5, marian_inference: Optional[MarianInferenceConfig] = None,
+                 routing_mode: str = ADAPTIVE):
+        # Backends are wrapped in CachedTranslator; backend-specific methods pass through
+        self.google: Optional[Translator] = None
+        self.marian: Optional[Translator] = None
+        self.llama: Optional[Translator] = None
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.backend_cache: Optional[TranslationCache] = None
+        self.result_cache: Optional[TranslationCache] = None
+        # (session, src, dest) -> {tuple of source sentences: translation} from the last incremental call
+        self._segments: Dict[tuple, Dict[str, str]] = {}
+        self.pool_sizes = pool_sizes
+        self._pools: Optional[WorkerPools] = None
+        self._pools_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # How many candidates LLaMA waits for: 1 starts on the first one, 2 waits for both.
+        self.llama_quorum = llama_quorum
+        self.candidate_timeout = candidate_timeout
+        # Chunk groups allowed in the pipeline at once (bounds memory and backend fan-out)
+        self.max_groups_in_flight = max(1, max_groups_in_flight)
+        # Groups per LLaMA arbitration prompt; 1 keeps one LLM call per group
+        self.llama_batch_size = max(1, llama_batch_size)
+        self.llama_batch_window = llama_batch_window
+        self._llama_batcher: Optional[ArbitrationBatcher] = None
+        # e.g. MarianInferenceConfig.optimized() for int8/greedy CPU inference
+        self.marian_inference = marian_inference
+        # ADAPTIVE picks backends from live latency/failure stats; MAX_QUALITY runs the full ensemble
+        self.routing = RoutingPolicy(mode=routing_mode)
+
+    def _load_caches(self):
+        if self.backend_cache is not None:
+            return
+        backend_disk = result_disk = None
+        if self.cache_path:
+            try:
+                backend_disk = SQLiteStore(self.cache_path, ttl=self.cache_ttl)
+                result_disk = SQLiteStore(self.cache_path, ttl=self.cache_ttl)
+            except Exception as e:
+                print(f"[TranslationManager] on-disk cache unavailable, using memory only: {e}")
+                backend_disk = result_disk = None
+        self.backend_cache = TranslationCache(LRUCache(max_entries=4096, ttl=self.cache_ttl), backend_disk)
+        self.result_cache = TranslationCache(LRUCache(max_entries=512, ttl=self.cache_ttl), result_disk)
 
     def _load_translators(self):
-        if not self.google:
-            self.google = GoogleTranslator()
-        if not self.marian:
-            self.marian = MarianTranslator()
-        if not self.llama:
-            self.llama = LlamaTranslator()
+        # Cheap: backends only load their models/connections on first use
+        with self._load_lock:
+            self._load_caches()
+            if not self.google:
+                self.google = CachedTranslator(GoogleTranslator(), self.backend_cache)
+            if not self.marian:
+                self.marian = CachedTranslator(MarianTranslator(inference=self.marian_inference), self.backend_cache)
+            if not self.llama:
+                self.llama = CachedTranslator(LlamaTranslator(), self.backend_cache)
+            if self.llama_batch_size > 1 and self._llama_batcher is None:
+                self._llama_batcher = ArbitrationBatcher(self.llama, self.llama_batch_window, self.llama_batch_size)
+
+    def warm_up(self, src_lang: str, dest_lang: str):
+        """Start loading the Marian model for a language pair in the background, ahead of first use."""
+        if src_lang == dest_lang:
+            return
+        self._load_translators()
+        self.marian.preload([(src_lang, dest_lang)])
+
+    def routing_stats(self) -> Dict[tuple, Dict]:
+        """Latency percentiles, failure and LLaMA agreement rates per (backend, src, dest)."""
+        return self.routing.snapshot()
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Hit/miss counters for the per-backend and final-result caches."""
+        if self.backend_cache is None:
+            return {}
+        return {"backend": self.backend_cache.stats(), "result": self.result_cache.stats()}
+
+    @property
+    def pools(self) -> WorkerPools:
+        with self._pools_lock:
+            if self._pools is None:
+                self._pools = WorkerPools(self.pool_sizes)
+            return self._pools
+
+    def shutdown(self):
+        """Stop the worker pools and flush the on-disk caches; called on application exit."""
+        with self._pools_lock:
+            if self._pools is not None:
+                self._pools.shutdown()
+                self._pools = None
+        for cache in (self.backend_cache, self.result_cache):
+            if cache is not None:
+                cache.close()
 
     def _split_into_chunks(self, text: str, max_sentences_per_chunk: int = 3) -> List[str]:
         sentences = re.split(r'(?<=[.!?]) +', text.strip())
@@ -29,66 +283,395 @@ class TranslationManager:
                 chunks.append(chunk)
         return chunks
 
-    def translate(self, text: str, src_lang: str, dest_lang: str, on_chunk_done: Optional[Callable[[str], None]] = None) -> str:
+    def _group_chunks(self, chunks: List[str], group_size: int = 2) -> List[str]:
+        return ['\n'.join(chunks[i:i + group_size]) for i in range(0, len(chunks), group_size)]
+
+    def _choose_best(self, job: _GroupJob, llama_result: Optional[str]) -> str:
+        if llama_result and not llama_result.startswith("❌"):
+            return llama_result
+        candidates = job.arbiter.candidates()
+        if not candidates:
+            return "❌ Translation failed for chunk."
+        return candidates[0]
+
+    def _start_group(self, text: str, src_lang: str, dest_lang: str, stages: WorkerPools) -> _GroupJob:
+        """
+        Submit a group's candidate translators according to the routing plan; LLaMA is queued
+        once the arbiter is ready, unless the routing policy decides it isn't worth the call.
+        """
+        plan = self.routing.plan(src_lang, dest_lang)
+        backends: Dict[str, Translator] = {"google": self.google, "marian": self.marian}
+
+        def finish(job: _GroupJob, llama_result: Optional[str] = None):
+            if not job.future.done():
+                job.future.set_result(self._choose_best(job, llama_result))
+
+        def run_llama(job: _GroupJob, candidates: List[str]):
+            llama_result = None
+            start = time.monotonic()
+            try:
+                llama_result = self.llama.translate(text, src_lang, dest_lang, candidates)
+            except Exception as e:
+                print(f"[llama] failed: {e}")
+            finally:
+                self.routing.record("llama", src_lang, dest_lang, time.monotonic() - start, bool(llama_result))
+                self.routing.record_llama_choice(src_lang, dest_lang, llama_result, candidates)
+                finish(job, llama_result)
+
+        def on_ready(candidates: List[str]):
+            if not self.routing.should_arbitrate(src_lang, dest_lang, candidates):
+                if self._llama_batcher is not None:
+                    self._llama_batcher.skip(src_lang, dest_lang)
+                finish(job)
+                return
+            if self._llama_batcher is not None:
+                start = time.monotonic()
+
+                def on_batch_done(future: Future):
+                    llama_result = None
+                    try:
+                        llama_result = future.result()
+                    except Exception as e:
+                        print(f"[llama] batch failed: {e}")
+                    self.routing.record("llama", src_lang, dest_lang, time.monotonic() - start, bool(llama_result))
+                    self.routing.record_llama_choice(src_lang, dest_lang, llama_result, candidates)
+                    finish(job, llama_result)
+
+                self._llama_batcher.submit(text, candidates, src_lang, dest_lang).add_done_callback(on_batch_done)
+            else:
+                stages["llama"].submit(run_llama, job, candidates)
+
+        # max_quality keeps the configured quorum; adaptive waits for every backend it actually runs,
+        # until a hedge is launched (see decide_hedge)
+        quorum = self.llama_quorum if self.routing.mode == MAX_QUALITY else len(plan.candidates)
+        job = _GroupJob(text, CandidateArbiter(text, plan.candidates, quorum=quorum, on_ready=on_ready))
+        if self._llama_batcher is not None:
+            self._llama_batcher.expect(src_lang, dest_lang)
+
+        primary, hedges = plan.candidates[0], plan.candidates[1:]
+        hedge_lock = threading.Lock()
+        hedge_state = {"decided": plan.hedge_after is None, "timer": None}
+
+        def decide_hedge(launch: bool):
+            with hedge_lock:
+                if hedge_state["decided"]:
+                    return
+                hedge_state["decided"] = True
+                if hedge_state["timer"] is not None:
+                    hedge_state["timer"].cancel()
+            if launch:
+                # The primary is slow or failed: the hedge is there to cut latency, so the first
+                # usable candidate from either side finishes the group and the other is ignored
+                job.arbiter.lower_quorum(1)
+            for name in hedges:
+                if launch:
+                    stages[name].submit(run_candidate, name)
+                else:
+                    job.arbiter.submit(name, None)  # skipped: counts as done so nothing waits on it
+
+        def run_candidate(name: str):
+            result = None
+            start = time.monotonic()
+            try:
+                result = backends[name].translate(text, src_lang, dest_lang)
+            except Exception as e:
+                print(f"[{name}] failed: {e}")
+            finally:
+                usable = bool(result) and result.strip().lower() != text.strip().lower()
+                self.routing.record(name, src_lang, dest_lang, time.monotonic() - start, usable)
+                if name == primary and hedges:
+                    # Primary answered before the deadline: no hedge. Primary failed: hedge right away.
+                    decide_hedge(launch=not usable)
+                # Always report, so a failed translator never leaves LLaMA waiting
+                job.arbiter.submit(name, result)
+
+        if plan.hedge_after is None:
+            for name in plan.candidates:
+                stages[name].submit(run_candidate, name)
+        else:
+            stages[primary].submit(run_candidate, primary)
+            with hedge_lock:
+                if not hedge_state["decided"]:
+                    hedge_state["timer"] = stages.scheduler.call_later(plan.hedge_after, lambda: decide_hedge(True))
+        return job
+
+    def _finish_group(self, job: _GroupJob, timeout: Optional[float] = None,
+                      has_deadline: bool = False) -> Tuple[str, bool]:
+        """
+        The group's result and whether it is final (False: best candidate so far, still refining).
+        `timeout` defaults to candidate_timeout * 3. When it runs out at a translate() deadline the
+        group's first candidate is used, or "" if none has arrived yet (never the failure marker);
+        the background refinement fills it in.
+        """
+        try:
+            return job.future.result(timeout=self.candidate_timeout * 3 if timeout is None else timeout), True
+        except FutureTimeoutError:
+            if not has_deadline:
+                print("[TranslationManager] group timed out, using best candidate so far")
+                return self._choose_best(job, None), False
+        candidates = job.arbiter.candidates()
+        return (candidates[0] if candidates else ""), False
+
+    def _run_pipeline_jobs(self, groups: List[str], src_lang: str, dest_lang: str,
+                           deadline: Optional[float] = None,
+                           cancelled: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[_GroupJob, str, bool]]:
+        """
+        Push groups through the stage pools within the in-flight window, yielding
+        (job, result, final) in order. Past `deadline` (time.monotonic()), every remaining
+        group is started at once and results are taken as they stand. Once `cancelled()`
+        returns True no further groups are started and TranslationCancelled is raised; groups
+        already in the pools run to completion but nobody waits for them.
+        """
+        # Enough groups in flight to fill an arbitration batch
+        window = max(self.max_groups_in_flight, self.llama_batch_size if self._llama_batcher else 1)
+        stages = self.pools
+        in_flight: List[_GroupJob] = []
+        next_group = 0
+        while next_group < len(groups) or in_flight:
+            if cancelled is not None and cancelled():
+                raise TranslationCancelled()
+            past_deadline = deadline is not None and time.monotonic() >= deadline
+            # Keep the window full so later groups translate while earlier ones are in arbitration
+            while next_group < len(groups) and (len(in_flight) < window or past_deadline):
+                in_flight.append(self._start_group(groups[next_group], src_lang, dest_lang, stages))
+                next_group += 1
+
+            # Reassemble strictly in document order
+            job = in_flight.pop(0)
+            limit = time.monotonic() + self.candidate_timeout * 3 if deadline is None else deadline
+            if cancelled is not None:
+                self._wait_unless_cancelled(job, limit, cancelled)
+            # Whatever the cancellation poll already waited comes off the group's allowance
+            timeout = max(0.0, limit - time.monotonic())
+            result, final = self._finish_group(job, timeout, has_deadline=deadline is not None)
+            yield job, result, final
+
+    def _wait_unless_cancelled(self, job: _GroupJob, limit: float, cancelled: Callable[[], bool],
+                               poll: float = 0.1):
+        """Wait for a group until `limit` (time.monotonic()), noticing a cancellation within `poll` seconds."""
+        while not job.future.done() and time.monotonic() < limit:
+            if cancelled():
+                raise TranslationCancelled()
+            wait_futures([job.future], timeout=min(poll, max(0.0, limit - time.monotonic())))
+        if cancelled():
+            raise TranslationCancelled()
+
+    def _prefetch_google(self, groups: List[str], src_lang: str, dest_lang: str):
+        """
+        Fetch Google's candidates for many groups in as few POSTs as possible before they enter
+        the pipeline; the results land in the backend cache, so each group's own Google call is
+        a cache hit. Skipped when the routing plan may not call Google for these groups at all.
+        """
+        if len(groups) < 2:
+            return
+        plan = self.routing.plan(src_lang, dest_lang)
+        if "google" not in plan.candidates or (plan.hedge_after is not None and plan.candidates[0] != "google"):
+            return
+        try:
+            self.google.translate_batch(groups, src_lang, dest_lang)
+        except Exception as e:
+            # The pipeline falls back to one request per group
+            print(f"[google] batch prefetch failed: {e}")
+
+    def _run_pipeline(self, groups: List[str], src_lang: str, dest_lang: str,
+                      cancelled: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+        for _, result, _ in self._run_pipeline_jobs(groups, src_lang, dest_lang, cancelled=cancelled):
+            yield result
+
+    def translate(self, text: str, src_lang: str, dest_lang: str, on_chunk_done: Optional[Callable[[str], None]] = None,
+                  deadline_ms: Optional[float] = None, cancelled: Optional[Callable[[], bool]] = None,
+                  on_refined: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Translate `text`, reporting the partial output through `on_chunk_done` as groups finish.
+        With `deadline_ms`, return the best candidates available when the budget runs out; groups
+        still being refined keep going in the background, and `on_refined` (`on_chunk_done` if not
+        given) receives the full upgraded text each time one of them lands. That can happen before
+        or after this call returns, on whichever thread finished the group.
+        `cancelled` is polled while waiting; once it returns True, TranslationCancelled is raised.
+        """
         self._load_translators()
 
         if src_lang == dest_lang:
             return text
 
-        chunks = self._split_into_chunks(text)
+        cache_key = TranslationCache.make_key(text, src_lang, dest_lang, "final")
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            if on_chunk_done:
+                on_chunk_done(cached)
+            return cached
+
+        deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms is not None else None
+        groups = self._group_chunks(self._split_into_chunks(text))
         final_output: List[str] = []
+        pending: List[Tuple[int, _GroupJob]] = []
+        for job, group_result, final in self._run_pipeline_jobs(groups, src_lang, dest_lang, deadline, cancelled):
+            if not final:
+                pending.append((len(final_output), job))
+            final_output.append(group_result)
+            if on_chunk_done:
+                on_chunk_done(self._join_groups(final_output))
+
+        result = self._join_groups(final_output)
+        if not pending:
+            self.result_cache.put(cache_key, result)
+        else:
+            self._refine_in_background(final_output, pending, cache_key, on_refined or on_chunk_done)
+        return result
+
+    @staticmethod
+    def _join_groups(outputs: List[str]) -> str:
+        # Groups still empty past the deadline are left out until their refinement lands
+        return "\n\n".join(o for o in outputs if o)
+
+    def _refine_in_background(self, outputs: List[str], pending: List[Tuple[int, _GroupJob]], cache_key: tuple,
+                              on_chunk_done: Optional[Callable[[str], None]]):
+        """
+        Swap in each provisional group's final result when it lands and report the upgraded text.
+        A group that was still empty at the deadline is first filled with its first candidate,
+        without waiting for arbitration.
+        """
+        outputs = list(outputs)
+        lock = threading.Lock()
+        finished = set()
 
-        for i in range(0, len(chunks), 2):
-            group_chunks = chunks[i:i + 2]
-            group_text = '\n'.join(group_chunks)
+        def upgrade(index: int, upgraded: Optional[str], final: bool):
+            with lock:
+                if index in finished:
+                    return  # the final result already landed; a late first candidate is stale
+                if final:
+                    finished.add(index)
+                changed = bool(upgraded) and upgraded != outputs[index]
+                if changed:
+                    outputs[index] = upgraded
+                text = self._join_groups(outputs)
+                done = len(finished) == len(pending)
+            if done:
+                self.result_cache.put(cache_key, text)
+            if changed and on_chunk_done:
+                on_chunk_done(text)
 
-            results: Dict[str, Optional[str]] = {
-                "google": None,
-                "marian": None,
-                "llama": None
+        def on_final(index: int, future: Future):
+            try:
+                upgraded = future.result()
+            except Exception as e:
+                print(f"[TranslationManager] background refinement failed: {e}")
+                upgraded = None
+            upgrade(index, upgraded, final=True)
+
+        for index, job in pending:
+            if not outputs[index]:
+                job.arbiter.on_first_candidate(lambda candidate, index=index: upgrade(index, candidate, final=False))
+            job.future.add_done_callback(lambda f, index=index: on_final(index, f))
+
+    def translate_incremental(self, text: str, src_lang: str, dest_lang: str, session: str = "default",
+                              on_chunk_done: Optional[Callable[[str], None]] = None,
+                              cancelled: Optional[Callable[[], bool]] = None) -> str:
+        """
+        Translate `text` reusing the translations from this session's previous call.
+        Translations are remembered per unit: a run of up to six consecutive sentences that went
+        through the pipeline as one group, as in translate(). Units whose sentences are unchanged
+        are reused; each contiguous run of new or edited sentences is regrouped and sent to the
+        backends, so the cost of a re-translate follows the size of the edit rather than the
+        size of the document, and edited sentences still keep their neighbours as context.
+        """
+        self._load_translators()
+
+        if src_lang == dest_lang:
+            return text
+
+        previous = self._segments.get((session, src_lang, dest_lang), {})
+        by_first: Dict[str, List[tuple]] = {}
+        for unit in previous:
+            by_first.setdefault(unit[0], []).append(unit)
+
+        # Each paragraph becomes a sequence of units, reused or new
+        layout: List[List[tuple]] = []
+        translations: Dict[tuple, str] = {}
+        for sentences in self._split_paragraphs(text):
+            units: List[tuple] = []
+            run: List[str] = []
+            i = 0
+            while i < len(sentences):
+                match = max(
+                    (u for u in by_first.get(sentences[i], []) if tuple(sentences[i:i + len(u)]) == u),
+                    key=len, default=None
+                )
+                if match is None:
+                    run.append(sentences[i])
+                    i += 1
+                    continue
+                units.extend(self._units_for_run(run))
+                run = []
+                units.append(match)
+                translations[match] = previous[match]
+                i += len(match)
+            units.extend(self._units_for_run(run))
+            layout.append(units)
+
+        changed = list(dict.fromkeys(u for units in layout for u in units if u not in translations))
+
+        def assemble() -> str:
+            return "\n\n".join(
+                " ".join(translations[u].replace("\n", " ") for u in units if u in translations)
+                for units in layout
+            )
+
+        groups = [self._unit_text(u) for u in changed]
+        self._prefetch_google(groups, src_lang, dest_lang)
+        try:
+            for unit, result in zip(changed, self._run_pipeline(groups, src_lang, dest_lang, cancelled)):
+                translations[unit] = result
+                if on_chunk_done:
+                    on_chunk_done(assemble())
+        finally:
+            # Keep only the current document's units, dropping failed ones so they are retried;
+            # a cancelled call still keeps the units it finished
+            self._segments[(session, src_lang, dest_lang)] = {
+                u: t for u, t in translations.items() if not t.startswith("❌")
             }
+        return assemble()
 
-            def run_translator(name: str, translator: Translator):
-                try:
-                    if name == "llama":
-                        # Wait for others to complete first
-                        while results["google"] is None and results["marian"] is None:
-                            pass  # Busy wait (can be improved using Condition)
-                        candidates = [r for r in [results["google"], results["marian"]] if r and r.strip().lower() != group_text.strip().lower()]
-                        if not candidates:
-                            results["llama"] = "\u274c No valid candidates for LLaMA."
-                            return
-                        results["llama"] = self.llama.translate(group_text, src_lang, dest_lang, candidates)
-                    else:
-                        results[name] = translator.translate(group_text, src_lang, dest_lang)
-                except Exception as e:
-                    print(f"[{name}] failed: {e}")
-                    results[name] = None
-
-            threads = [
-                threading.Thread(target=run_translator, args=("google", self.google)),
-                threading.Thread(target=run_translator, args=("marian", self.marian)),
-                threading.Thread(target=run_translator, args=("llama", self.llama))
-            ]
+    def _units_for_run(self, run: List[str], max_sentences_per_chunk: int = 3, group_size: int = 2) -> List[tuple]:
+        """Cut a run of changed sentences into units the size of one translate() group."""
+        size = max_sentences_per_chunk * group_size
+        return [tuple(run[i:i + size]) for i in range(0, len(run), size)]
 
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join(timeout=30)
+    def _unit_text(self, unit: tuple, max_sentences_per_chunk: int = 3) -> str:
+        # Same layout as _group_chunks(_split_into_chunks(...)): sentences per chunk, chunks per line
+        return "\n".join(
+            " ".join(unit[i:i + max_sentences_per_chunk]) for i in range(0, len(unit), max_sentences_per_chunk)
+        )
 
-            # Choose best translation
-            if results["llama"] and not results["llama"].startswith("\u274c"):
-                final_output.append(results["llama"])
-            else:
-                candidates = [r for r in [results["google"], results["marian"]] if r and r.strip().lower() != group_text.strip().lower()]
-                if not candidates:
-                    final_output.append("\u274c Translation failed for chunk.")
-                else:
-                    final_output.append(candidates[0])
+    def _split_paragraphs(self, text: str) -> List[List[str]]:
+        paragraphs = re.split(r'\n\s*\n', text.strip())
+        return [
+            [s.strip() for s in re.split(r'(?<=[.!?])\s+', p.strip()) if s.strip()]
+            for p in paragraphs if p.strip()
+        ]
 
-            # Emit partial output for UI update (threaded call to avoid blocking)
-            if on_chunk_done:
-                partial_result = "\n\n".join(final_output)
-                threading.Thread(target=on_chunk_done, args=(partial_result,), daemon=True).start()
+    def translate_stream(self, text: str, src_lang: str, dest_lang: str,
+                         cancelled: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+        """
+        Yield the translation of each paragraph of `text` as soon as it is complete, in order.
+        All paragraphs share one pipeline, so later paragraphs are already in flight while
+        earlier ones are being arbitrated.
+        """
+        self._load_translators()
+
+        paragraphs = [" ".join(p) for p in self._split_paragraphs(text)]
+        if src_lang == dest_lang:
+            yield from paragraphs
+            return
+
+        groups: List[str] = []
+        group_counts: List[int] = []
+        for paragraph in paragraphs:
+            paragraph_groups = self._group_chunks(self._split_into_chunks(paragraph))
+            groups.extend(paragraph_groups)
+            group_counts.append(len(paragraph_groups))
 
-        return "\n\n".join(final_output)
\ No newline at end of file
+        self._prefetch_google(groups, src_lang, dest_lang)
+        results = self._run_pipeline(groups, src_lang, dest_lang, cancelled)
+        for count in group_counts:
+            yield "\n".join(next(results) for _ in range(count))
\ No newline at end of file
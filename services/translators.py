@@ -1,9 +1,18 @@
+import json
+import os
+import re
 import requests
 import subprocess
+import threading
+import time
+import queue
+from requests.adapters import HTTPAdapter
 from abc import ABC, abstractmethod
-from typing import Optional
-from transformers.models.marian import MarianMTModel, MarianTokenizer
-import torch
+from concurrent.futures import Future
+from typing import Optional, List, Dict, Tuple, Iterable
+from services.model_registry import ModelRegistry, ModelUnavailable
+from services.http_client import ResilientSession, CircuitOpenError
+from services.connectivity import ConnectivityMonitor, get_monitor
 
 
 class Translator(ABC):
@@ -17,30 +26,122 @@ class Translator(ABC):
 
 
 class GoogleTranslator(Translator):
+    """
+    Google Translate (gtx endpoint) over a shared ResilientSession: pooled keep-alive
+    connections, timeouts, retries with jittered backoff, a concurrency cap and a circuit
+    breaker, so a failing endpoint returns None quickly instead of stalling the pipeline.
+    Text is sent in the POST body, and translate_batch packs many segments into one request.
+    While the shared connectivity monitor reports offline, only its periodic retry request is sent.
+    """
+    DEFAULT_URL = "https://translate.googleapis.com/translate_a/single"
+    _shared_client: Optional[ResilientSession] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, url: Optional[str] = None, client: Optional[ResilientSession] = None,
+                 max_batch_chars: int = 4500, connectivity: Optional[ConnectivityMonitor] = None):
+        self.url = url or self.DEFAULT_URL
+        self.client = client or self._default_client()
+        self.max_batch_chars = max_batch_chars
+        self.connectivity = connectivity or get_monitor()
+
+    @classmethod
+    def _default_client(cls) -> ResilientSession:
+        with cls._shared_lock:
+            if cls._shared_client is None:
+                cls._shared_client = ResilientSession(rate=10)
+            return cls._shared_client
+
+    def _request(self, text: str, src_lang: str, dest_lang: str) -> Optional[str]:
+        params = {"client": "gtx", "sl": src_lang, "tl": dest_lang, "dt": "t"}
+        response = self.client.post(self.url, params=params, data={"q": text})
+        if response.status_code != 200:
+            print(f"[GoogleTranslator] HTTP {response.status_code}")
+            return None
+        data = response.json()
+        return "".join([t[0] for t in data[0] if t and t[0]])
+
     def translate(self, text: str, src_lang: str, dest_lang: str) -> Optional[str]:
+        if not self.connectivity.should_try():
+            return None
         try:
-            url = "https://translate.googleapis.com/translate_a/single"
-            params = {"client": "gtx", "sl": src_lang, "tl": dest_lang, "dt": "t", "q": text}
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                return "".join([t[0] for t in data[0]])
+            result = self._request(text, src_lang, dest_lang)
+            self.connectivity.report_success()
+            return result
+        except CircuitOpenError:
+            return None
+        except (requests.ConnectionError, requests.Timeout) as e:
+            print(f"[GoogleTranslator] failed: {e}")
+            self.connectivity.report_failure()
         except Exception as e:
             print(f"[GoogleTranslator] failed: {e}")
         return None
 
+    def translate_batch(self, texts: List[str], src_lang: str, dest_lang: str) -> List[Optional[str]]:
+        """
+        Translate several segments with as few requests as possible. Segments are joined by
+        newlines and split back by line count; a batch whose line count doesn't survive the
+        round trip is retried one segment at a time.
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        batch: List[int] = []
+        size = 0
+        for i, text in enumerate(texts):
+            if batch and size + len(text) > self.max_batch_chars:
+                self._translate_packed(texts, batch, src_lang, dest_lang, results)
+                batch, size = [], 0
+            batch.append(i)
+            size += len(text) + 1
+        if batch:
+            self._translate_packed(texts, batch, src_lang, dest_lang, results)
+        return results
+
+    def _translate_packed(self, texts: List[str], indices: List[int], src_lang: str, dest_lang: str,
+                          results: List[Optional[str]]):
+        if len(indices) > 1:
+            line_counts = [len(texts[i].split("\n")) for i in indices]
+            packed = self.translate("\n".join(texts[i] for i in indices), src_lang, dest_lang)
+            lines = packed.split("\n") if packed else []
+            if len(lines) == sum(line_counts):
+                start = 0
+                for i, count in zip(indices, line_counts):
+                    results[i] = "\n".join(lines[start:start + count])
+                    start += count
+                return
+        for i in indices:
+            results[i] = self.translate(texts[i], src_lang, dest_lang)
+
 
 class LlamaTranslator(Translator):
     """
-    LlamaTranslator: A language translation class leveraging the Llama model via the Ollama CLI.
+    LlamaTranslator: A language translation class leveraging the Llama model via Ollama.
     This class provides an interface to translate text between languages using the Llama language model.
     It supports both direct translation and selection of the best translation from a list of candidates.
-    The translation is performed by constructing a prompt and invoking the Llama model through a subprocess call.
+    Prompts go to a long-running Ollama server over a pooled keep-alive HTTP session and the reply is
+    streamed, stopping as soon as the first line is complete. If the server is unreachable, the
+    `ollama run` CLI is used instead and the server is retried after `http_retry_after` seconds.
     Usage:
-        translator = LlamaTranslator()
+        translator = LlamaTranslator(model="llama3")
         result = translator.translate("Hello", "English", "Spanish")
     """
-    def translate(self, text: str, src_lang: str, dest_lang: str, candidates: Optional[list[str]] = None) -> Optional[str]:
+    def __init__(self, model: str = "llama3", base_url: Optional[str] = None, timeout: float = 60,
+                 keep_alive: str = "10m", reuse_context: bool = False, http_retry_after: float = 30):
+        self.model = model
+        base_url = base_url or os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+        if not base_url.startswith("http"):
+            base_url = f"http://{base_url}"
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        # Keeps the model resident in the server between calls
+        self.keep_alive = keep_alive
+        # Feed each reply's context back into the next prompt (useful across chunks of one document)
+        self.reuse_context = reuse_context
+        self.http_retry_after = http_retry_after
+        self._context: Optional[list] = None
+        self._http_down_until = 0.0
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+
+    def _build_prompt(self, text: str, src_lang: str, dest_lang: str, candidates: Optional[list[str]]) -> str:
         if candidates:
             prompt = (
                 f"You are an expert in language translation. You are given a phrase in {src_lang}, "
@@ -58,15 +159,113 @@ class LlamaTranslator(Translator):
                 f"Here is the text:\n\"{text}\"\n"
                 f"Translation:"
             )
+        return prompt
+
+    def _generate_http(self, prompt: str, first_line_only: bool = True) -> Optional[str]:
+        payload = {"model": self.model, "prompt": prompt, "stream": True, "keep_alive": self.keep_alive}
+        if self.reuse_context and self._context:
+            payload["context"] = self._context
+
+        parts: List[str] = []
+        with self.session.post(f"{self.base_url}/api/generate", json=payload, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                parts.append(chunk.get("response", ""))
+                if chunk.get("done"):
+                    if "context" in chunk:
+                        self._context = chunk["context"]
+                    break
+                # Only the first line is used, so stop generating once it is complete
+                text = "".join(parts).lstrip()
+                if first_line_only and "\n" in text:
+                    break
+        text = "".join(parts).strip()
+        return text.splitlines()[0] if first_line_only and text else text
+
+    def _generate_cli(self, prompt: str, first_line_only: bool = True) -> Optional[str]:
+        result = subprocess.run(
+            ["ollama", "run", self.model],
+            input=prompt.encode("utf-8"),
+            capture_output=True,
+            timeout=self.timeout
+        )
+        text = result.stdout.decode("utf-8").strip()
+        return text.splitlines()[0] if first_line_only and text else text
+
+    def generate(self, prompt: str, first_line_only: bool = True) -> Optional[str]:
+        """Run a raw prompt, preferring the HTTP server and falling back to the CLI."""
+        if time.monotonic() >= self._http_down_until:
+            try:
+                return self._generate_http(prompt, first_line_only)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                print(f"[LlamaTranslator] server unavailable, falling back to CLI: {e}")
+                self._http_down_until = time.monotonic() + self.http_retry_after
+        return self._generate_cli(prompt, first_line_only)
 
+    def _build_batch_prompt(self, items: List[Tuple[str, List[str]]], src_lang: str, dest_lang: str) -> str:
+        prompt = (
+            f"You are an expert in language translation. For each numbered item below you are given a phrase "
+            f"in {src_lang} and multiple translations to {dest_lang}. For every item, choose the most accurate "
+            f"and natural translation.\n\n"
+        )
+        for n, (text, candidates) in enumerate(items, start=1):
+            prompt += f"Item {n}\nOriginal: {text}\nCandidates:\n"
+            for i, c in enumerate(candidates):
+                prompt += f"{i+1}. {c}\n"
+            prompt += "\n"
+        prompt += (
+            "Respond with ONLY a JSON object mapping every item number to the number of its best candidate, "
+            'for example {"1": 2, "2": 1}. No explanation.'
+        )
+        return prompt
+
+    @staticmethod
+    def _parse_batch_choices(response: str, items: List[Tuple[str, List[str]]]) -> List[Optional[str]]:
+        """Map the JSON reply back to chosen candidates; items that can't be parsed come back as None."""
+        match = re.search(r"\{.*\}", response or "", re.DOTALL)
+        if not match:
+            return [None] * len(items)
         try:
-            result = subprocess.run(
-                ["ollama", "run", "llama3"],
-                input=prompt.encode("utf-8"),
-                capture_output=True,
-                timeout=60
-            )
-            response = result.stdout.decode("utf-8").strip().splitlines()[0]
+            choices = json.loads(match.group(0))
+        except ValueError:
+            return [None] * len(items)
+
+        selected: List[Optional[str]] = []
+        for n, (_, candidates) in enumerate(items, start=1):
+            try:
+                index = int(choices[str(n)]) - 1
+                selected.append(candidates[index].strip() if 0 <= index < len(candidates) else None)
+            except (KeyError, TypeError, ValueError):
+                selected.append(None)
+        return selected
+
+    def select_batch(self, items: List[Tuple[str, List[str]]], src_lang: str, dest_lang: str) -> List[Optional[str]]:
+        """
+        Arbitrate many chunk groups with a single LLM call. `items` holds (original, candidates) pairs.
+        Items whose choice can't be parsed from the reply fall back to an individual translate() call.
+        """
+        if len(items) == 1:
+            return [self.translate(items[0][0], src_lang, dest_lang, items[0][1])]
+
+        selected: List[Optional[str]] = [None] * len(items)
+        try:
+            response = self.generate(self._build_batch_prompt(items, src_lang, dest_lang), first_line_only=False)
+            selected = self._parse_batch_choices(response, items)
+        except Exception as e:
+            print(f"[LlamaTranslator] batch arbitration failed: {e}")
+
+        for n, (text, candidates) in enumerate(items):
+            if selected[n] is None:
+                selected[n] = self.translate(text, src_lang, dest_lang, candidates)
+        return selected
+
+    def translate(self, text: str, src_lang: str, dest_lang: str, candidates: Optional[list[str]] = None) -> Optional[str]:
+        prompt = self._build_prompt(text, src_lang, dest_lang, candidates)
+        try:
+            response = self.generate(prompt)
             if candidates:
                 for c in candidates:
                     if c.strip() in response:
@@ -77,38 +276,234 @@ class LlamaTranslator(Translator):
         return None
 
 
+class MarianBatcher:
+    """
+    Coalesces concurrent MarianTranslator.translate calls into batched generate() calls.
+    Requests that arrive within `window` seconds of each other are grouped per (src, tgt)
+    model and dispatched together, up to `max_batch_size` texts at a time.
+    """
+    def __init__(self, translator: "MarianTranslator", window: float = 0.01, max_batch_size: int = 16):
+        self.translator = translator
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.Queue[Tuple[str, str, str, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="marian-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, src_lang: str, dest_lang: str) -> Future:
+        future: Future = Future()
+        self._queue.put((text, src_lang, dest_lang, future))
+        return future
+
+    def _collect(self) -> List[Tuple[str, str, str, Future]]:
+        pending = [self._queue.get()]
+        while len(pending) < self.max_batch_size:
+            try:
+                pending.append(self._queue.get(timeout=self.window))
+            except queue.Empty:
+                break
+        return pending
+
+    def _run(self):
+        while True:
+            by_pair: Dict[Tuple[str, str], List[Tuple[str, Future]]] = {}
+            for text, src, tgt, future in self._collect():
+                by_pair.setdefault((src, tgt), []).append((text, future))
+
+            for (src, tgt), items in by_pair.items():
+                try:
+                    outputs = self.translator.translate_batch([t for t, _ in items], src, tgt)
+                    for (_, future), out in zip(items, outputs):
+                        future.set_result(out)
+                except Exception as e:
+                    for _, future in items:
+                        future.set_exception(e)
+
+
+MARIAN_EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "marian_onnx")
+
+
+class MarianInferenceConfig:
+    """
+    Runtime and generation settings for MarianTranslator.
+    The defaults reproduce stock fp32 inference; `optimized()` is the fast CPU preset.
+        quantize: dynamic int8 quantization of the model's Linear layers
+        num_threads: torch intra-op threads (process-wide, applied on first model load)
+        num_beams: 1 for greedy decoding, None for the model's default beam search
+        max_length_ratio: cap output at ratio * input tokens (+ a small margin)
+        runtime: "torch", or "onnx" to export once to `export_dir` and run with onnxruntime
+    """
+    def __init__(self, quantize: bool = False, num_threads: Optional[int] = None, num_beams: Optional[int] = None,
+                 max_length_ratio: Optional[float] = None, runtime: str = "torch",
+                 export_dir: str = MARIAN_EXPORT_DIR):
+        self.quantize = quantize
+        self.num_threads = num_threads
+        self.num_beams = num_beams
+        self.max_length_ratio = max_length_ratio
+        self.runtime = runtime
+        self.export_dir = export_dir
+
+    @classmethod
+    def optimized(cls, **overrides) -> "MarianInferenceConfig":
+        settings = {"quantize": True, "num_beams": 1, "max_length_ratio": 2.0}
+        settings.update(overrides)
+        return cls(**settings)
+
+    def generate_kwargs(self, input_length: int) -> dict:
+        kwargs = {}
+        if self.num_beams is not None:
+            kwargs["num_beams"] = self.num_beams
+        if self.max_length_ratio is not None:
+            kwargs["max_new_tokens"] = int(input_length * self.max_length_ratio) + 8
+        return kwargs
+
+    def __repr__(self):
+        return (f"MarianInferenceConfig(runtime={self.runtime!r}, quantize={self.quantize}, "
+                f"num_beams={self.num_beams}, max_length_ratio={self.max_length_ratio}, "
+                f"num_threads={self.num_threads})")
+
+
 class MarianTranslator(Translator):
-    def __init__(self):
-        self.models = {}
-        preload_pairs = [('en', 'ur'), ('ur', 'en')]
-        for src, tgt in preload_pairs:
-            self.load_model(src, tgt)
+    """
+    MarianMT (Helsinki-NLP opus-mt) translator. Models load on first use into a ModelRegistry
+    bounded by `memory_budget` bytes (least recently used pairs are evicted). When a direct
+    model is missing, or evicted while both legs through `pivot_lang` are resident, the text
+    is routed through the pivot language instead (e.g. ar -> en -> ur).
+    `inference` sets the default MarianInferenceConfig; `pair_inference` overrides it per (src, tgt).
+    """
+    def __init__(self, batch_window: float = 0.01, max_batch_size: int = 16,
+                 preload_pairs: Optional[Iterable[Tuple[str, str]]] = None,
+                 memory_budget: Optional[int] = 1200 * 2**20, pivot_lang: Optional[str] = "en",
+                 inference: Optional[MarianInferenceConfig] = None,
+                 pair_inference: Optional[Dict[Tuple[str, str], MarianInferenceConfig]] = None):
+        self.max_batch_size = max_batch_size
+        self.pivot_lang = pivot_lang
+        self.inference = inference or MarianInferenceConfig()
+        self.pair_inference = dict(pair_inference or {})
+        self._threads_configured = False
+        self.registry = ModelRegistry(self._load_pair, memory_budget=memory_budget)
+        # Serializes generate() calls: one batched forward pass at a time is faster on CPU
+        self._generate_lock = threading.Lock()
+        self.batcher = MarianBatcher(self, window=batch_window, max_batch_size=max_batch_size)
+        # Models load on first use; pairs listed here start loading in the background right away
+        if preload_pairs:
+            self.preload(preload_pairs)
+
+    def preload(self, pairs: Iterable[Tuple[str, str]]):
+        """Load models on a background thread so the first translation doesn't pay for it."""
+        pairs = [(src, tgt) for src, tgt in pairs if src != tgt and not self.registry.is_resident((src, tgt))]
+        if not pairs:
+            return
+
+        def run():
+            for src, tgt in pairs:
+                self.load_model(src, tgt)
+
+        threading.Thread(target=run, name="marian-preload", daemon=True).start()
+
+    def inference_for(self, pair: Tuple[str, str]) -> MarianInferenceConfig:
+        return self.pair_inference.get(pair, self.inference)
+
+    def _load_pair(self, key: Tuple[str, str]):
+        model_name = f'Helsinki-NLP/opus-mt-{key[0]}-{key[1]}'
+        config = self.inference_for(key)
+        print(f"[MarianTranslator] Loading model: {model_name} ({config})")
+        # Deferred so importing this module (and starting the app) doesn't pay for torch/transformers
+        import torch
+        from transformers.models.marian import MarianMTModel, MarianTokenizer
+
+        if config.num_threads and not self._threads_configured:
+            torch.set_num_threads(config.num_threads)
+            self._threads_configured = True
+
+        tokenizer = MarianTokenizer.from_pretrained(model_name)
+        if config.runtime == "onnx":
+            model = self._load_onnx(model_name, config)
+            if model is not None:
+                return tokenizer, model
+
+        model = MarianMTModel.from_pretrained(model_name)
+        model.eval()
+        if config.quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return tokenizer, model
+
+    def _load_onnx(self, model_name: str, config: MarianInferenceConfig):
+        """Load an onnxruntime model, exporting and caching it on disk the first time. None if unavailable."""
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError:
+            print("[MarianTranslator] optimum[onnxruntime] not installed, using torch runtime")
+            return None
+
+        export_path = os.path.join(config.export_dir, model_name.replace("/", "--"))
+        try:
+            if os.path.isdir(export_path):
+                return ORTModelForSeq2SeqLM.from_pretrained(export_path)
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+            model.save_pretrained(export_path)
+            return model
+        except Exception as e:
+            print(f"[MarianTranslator] ONNX export failed for {model_name}, using torch runtime: {e}")
+            return None
 
     def load_model(self, src_lang: str, tgt_lang: str):
         if src_lang == tgt_lang:
             return None, None
+        try:
+            return self.registry.load((src_lang, tgt_lang))
+        except ModelUnavailable as e:
+            print(f"[MarianTranslator] Failed to load opus-mt-{src_lang}-{tgt_lang}: {e}")
+            return None, None
 
-        model_name = f'Helsinki-NLP/opus-mt-{src_lang}-{tgt_lang}'
-        if (src_lang, tgt_lang) not in self.models:
-            print(f"[MarianTranslator] Loading model: {model_name}")
-            try:
-                tokenizer = MarianTokenizer.from_pretrained(model_name)
-                model = MarianMTModel.from_pretrained(model_name)
-                self.models[(src_lang, tgt_lang)] = (tokenizer, model)
-            except Exception as e:
-                print(f"[MarianTranslator] Failed to load {model_name}: {e}")
-                return None, None
-        return self.models[(src_lang, tgt_lang)]
+    def resident_models(self) -> Dict[Tuple[str, str], int]:
+        """Resident bytes per loaded (src, tgt) model."""
+        return self.registry.resident()
 
     def translate(self, text: str, src_lang: str, dest_lang: str) -> Optional[str]:
         if src_lang == dest_lang:
             return text
+        # Goes through the micro-batcher so concurrent chunk groups share one forward pass
+        return self.batcher.submit(text, src_lang, dest_lang).result()
 
-        tokenizer, model = self.load_model(src_lang, dest_lang)
-        if tokenizer is None or model is None:
-            return None
+    def _routes(self, src_lang: str, dest_lang: str) -> List[List[Tuple[str, str]]]:
+        direct = [(src_lang, dest_lang)]
+        pivot = self.pivot_lang
+        if not pivot or pivot in (src_lang, dest_lang):
+            return [direct]
+        via_pivot = [(src_lang, pivot), (pivot, dest_lang)]
+        # Evicted direct model but both pivot legs are warm: pivot now rather than reload and evict
+        if not self.registry.is_resident(direct[0]) and all(self.registry.is_resident(leg) for leg in via_pivot):
+            return [via_pivot, direct]
+        return [direct, via_pivot]
+
+    def translate_batch(self, texts: List[str], src_lang: str, dest_lang: str) -> List[Optional[str]]:
+        """Translate many texts with as few generate() calls as possible, preserving input order."""
+        if src_lang == dest_lang:
+            return list(texts)
+
+        for route in self._routes(src_lang, dest_lang):
+            try:
+                outputs = list(texts)
+                for leg in route:
+                    outputs = self._generate_batch(outputs, leg)
+                return outputs
+            except ModelUnavailable as e:
+                print(f"[MarianTranslator] {' -> '.join(p[0] for p in route)} -> {dest_lang} unavailable: {e}")
+        return [None] * len(texts)
 
-        batch = tokenizer([text], return_tensors="pt", padding=True)
-        gen = model.generate(**batch)
-        translation = tokenizer.batch_decode(gen, skip_special_tokens=True)[0]
-        return translation
\ No newline at end of file
+    def _generate_batch(self, texts: List[str], pair: Tuple[str, str]) -> List[str]:
+        import torch
+        config = self.inference_for(pair)
+        with self.registry.acquire(pair) as (tokenizer, model):
+            # Sort by length so each batch pads to similar-sized inputs
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            results: List[str] = [""] * len(texts)
+            for start in range(0, len(order), self.max_batch_size):
+                indices = order[start:start + self.max_batch_size]
+                batch = tokenizer([texts[i] for i in indices], return_tensors="pt", padding=True)
+                with self._generate_lock, torch.inference_mode():
+                    gen = model.generate(**batch, **config.generate_kwargs(batch["input_ids"].shape[1]))
+                for i, translation in zip(indices, tokenizer.batch_decode(gen, skip_special_tokens=True)):
+                    results[i] = translation
+            return results
\ No newline at end of file
@@ -0,0 +1,205 @@
+# services/tts_cache.py
+
+import hashlib
+import os
+import threading
+import wave
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_TTS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tts_cache")
+
+
+class AudioClip:
+    """Decoded mono 16-bit speech, ready to hand to the playback service."""
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+
+class ByteBudgetLRU:
+    """Thread-safe in-process LRU of AudioClips, bounded by total sample bytes rather than entry count."""
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, AudioClip]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[AudioClip]:
+        with self._lock:
+            clip = self._data.get(key)
+            if clip is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return clip
+
+    def put(self, key: Hashable, clip: AudioClip):
+        if clip.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._data[key] = clip
+            self._bytes += clip.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._data), "bytes": self._bytes}
+
+
+class AudioFileStore:
+    """
+    On-disk clip store (one WAV per key) that survives restarts. Hits refresh the file's mtime,
+    and the least recently used files are deleted once the directory exceeds `max_bytes`.
+    """
+    def __init__(self, directory: str = DEFAULT_TTS_CACHE_DIR, max_bytes: int = 200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".wav"))
+
+    @staticmethod
+    def _digest(key: Tuple) -> str:
+        return hashlib.sha256("\x1f".join(map(str, key)).encode("utf-8")).hexdigest()
+
+    def _path(self, key: Tuple) -> str:
+        return os.path.join(self.directory, self._digest(key) + ".wav")
+
+    def get(self, key: Tuple) -> Optional[AudioClip]:
+        path = self._path(key)
+        try:
+            with wave.open(path, "rb") as wav:
+                samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+                clip = AudioClip(samples, wav.getframerate())
+            os.utime(path)
+        except (FileNotFoundError, wave.Error, EOFError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return clip
+
+    def put(self, key: Tuple, clip: AudioClip):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with wave.open(tmp_path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(clip.sample_rate)
+                wav.writeframes(clip.samples.tobytes())
+            size = os.path.getsize(tmp_path)
+            with self._lock:
+                if os.path.exists(path):
+                    self._bytes -= os.path.getsize(path)
+                os.replace(tmp_path, path)
+                self._bytes += size
+                if self._bytes > self.max_bytes:
+                    self._prune()
+        except OSError as e:
+            print(f"[AudioFileStore] failed to write {path}: {e}")
+
+    def _prune(self):
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".wav")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._bytes -= size
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "bytes": self._bytes}
+
+
+class TTSAudioCache:
+    """Two-tier synthesized-speech cache: in-memory LRU first, then the optional on-disk store (hits are promoted)."""
+    def __init__(self, memory: Optional[ByteBudgetLRU] = None, disk: Optional[AudioFileStore] = None):
+        self.memory = memory or ByteBudgetLRU()
+        self.disk = disk
+
+    @staticmethod
+    def make_key(text: str, lang_code: str, voice: str) -> Tuple:
+        return (text, lang_code, voice)
+
+    def get(self, key: Tuple) -> Optional[AudioClip]:
+        clip = self.memory.get(key)
+        if clip is None and self.disk is not None:
+            clip = self.disk.get(key)
+            if clip is not None:
+                self.memory.put(key, clip)
+        return clip
+
+    def put(self, key: Tuple, clip: AudioClip):
+        if clip is None or not len(clip.samples):
+            return
+        self.memory.put(key, clip)
+        if self.disk is not None:
+            self.disk.put(key, clip)
+
+    def prewarm(self, phrases: Iterable[str], lang_code: str, voice: str,
+                synthesize: Callable[[str, str], AudioClip]) -> threading.Thread:
+        """Synthesize any phrases not cached yet on a background thread."""
+        def run():
+            for phrase in phrases:
+                key = self.make_key(phrase, lang_code, voice)
+                if self.get(key) is not None:
+                    continue
+                try:
+                    self.put(key, synthesize(phrase, lang_code))
+                except Exception as e:
+                    print(f"[TTSAudioCache] prewarm failed for {phrase!r}: {e}")
+                    return
+
+        thread = threading.Thread(target=run, name="tts-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+_default_cache: Optional[TTSAudioCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def default_tts_cache() -> TTSAudioCache:
+    """Process-wide cache shared by every TTSEngine, so a phrase spoken on one page replays instantly on another."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                disk = AudioFileStore()
+            except OSError as e:
+                print(f"[TTSAudioCache] disk store unavailable: {e}")
+                disk = None
+            _default_cache = TTSAudioCache(disk=disk)
+        return _default_cache
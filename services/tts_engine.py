@@ -1,12 +1,18 @@
 # services/tts_engine.py
 
-import os
-import socket
-import time
-from gtts import gTTS
-import pyttsx3
-import pygame
-import sounddevice as sd
+import io
+import queue
+import re
+import threading
+from typing import Callable, List, Optional
+from gtts import gTTS, gTTSError
+import miniaudio
+import numpy as np
+import requests
+
+from services.audio_playback import PlaybackHandle, device_name, get_playback
+from services.connectivity import ConnectivityMonitor, get_monitor
+from services.tts_cache import AudioClip, TTSAudioCache, default_tts_cache
 
 SUPPORTED_LANGUAGES = {
     "en": "english",
@@ -14,91 +20,184 @@ SUPPORTED_LANGUAGES = {
     "ur": "urdu"
 }
 
+# Sentence ends in the supported scripts: Latin punctuation, Arabic question mark, Urdu full stop
+_SENTENCE_END = re.compile(r"(?<=[.!?؟۔])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
 
 class TTSEngine:
     """
     TTSEngine: A flexible Text-to-Speech (TTS) engine supporting both online (gTTS) and offline (pyttsx3) synthesis.
-    This class provides a unified interface for converting text to speech, automatically selecting between Google Text-to-Speech (gTTS) when internet connectivity is available, and falling back to the offline pyttsx3 engine otherwise. It supports playback through selectable audio output devices and includes utility methods for safe file deletion and device management.
+    This class provides a unified interface for converting text to speech, automatically selecting between Google Text-to-Speech (gTTS) when internet connectivity is available, and falling back to the offline pyttsx3 engine otherwise. Online speech is streamed sentence by sentence: sentence N+1 is synthesized while sentence N plays, and audio is decoded and played from memory. Synthesized sentences are cached per (text, language, voice), so replays and repeated phrases skip the network entirely. It supports playback through selectable audio output devices.
     Attributes:
         engine (pyttsx3.Engine): The offline TTS engine instance.
         output_device_index (int or None): Index of the selected audio output device for playback.
+        cache (TTSAudioCache): Synthesized-speech cache, shared process-wide by default.
     Methods:
         set_output_device(index): Set the output device index for audio playback.
-        is_connected(timeout): Check for internet connectivity.
-        safe_delete(file_path, retries, delay): Safely delete a file with retries.
-        play_audio(file_path): Play an audio file through the selected output device.
+        is_connected(): Cached connectivity from the shared background monitor (with periodic retries while offline).
+        synthesize(sentence, lang_code): Decoded audio for one sentence, from the cache or gTTS.
+        prewarm(phrases, lang_code): Synthesize common phrases into the cache in the background.
+        play_clip(clip): Queue a decoded clip on the selected device's persistent output stream.
+        stop(): Immediately silence the selected output device.
         get_device_name(): Get the name of the selected output device.
-        speak(text, lang_code): Convert text to speech and play it, using gTTS if online, otherwise pyttsx3.
+        speak(text, lang_code, cancelled): Convert text to speech and play it, using gTTS if online, otherwise pyttsx3.
     """
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty("rate", 150)
-        self.engine.setProperty("volume", 1.0)
+    def __init__(self, lookahead: int = 2, cache: Optional[TTSAudioCache] = None, voice: str = "gtts",
+                 connectivity: Optional[ConnectivityMonitor] = None):
+        self._engine = None  # pyttsx3 is initialized on first offline use, not at app startup
         self.output_device_index = None  # ⬅️ NEW
+        self.lookahead = lookahead  # sentences synthesized ahead of playback
+        self.cache = cache or default_tts_cache()
+        self.voice = voice
+        self.connectivity = connectivity or get_monitor()
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+            self._engine.setProperty("rate", 150)
+            self._engine.setProperty("volume", 1.0)
+        return self._engine
 
     def set_output_device(self, index: int):
         """Set the selected output device index for playback (used for gTTS only)."""
         self.output_device_index = index
 
-    def is_connected(self, timeout=2):
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=timeout)
-            return True
-        except OSError:
-            return False
+    def is_connected(self):
+        return self.connectivity.should_try()
 
-    def safe_delete(self, file_path, retries=5, delay=0.3):
-        for _ in range(retries):
+    def _cache_key(self, sentence, lang_code):
+        return TTSAudioCache.make_key(sentence, lang_code, self.voice)
+
+    @staticmethod
+    def _fetch_gtts(sentence, lang_code) -> bytes:
+        """gTTS MP3 bytes for one sentence (the network part)."""
+        mp3 = io.BytesIO()
+        gTTS(text=sentence, lang=lang_code).write_to_fp(mp3)
+        return mp3.getvalue()
+
+    @staticmethod
+    def _decode_mp3(data: bytes) -> AudioClip:
+        """Decode MP3 to mono 16-bit PCM in-process (miniaudio bundles its decoder; no ffmpeg needed)."""
+        decoded = miniaudio.mp3_read_s16(data)
+        samples = np.frombuffer(decoded.samples, dtype=np.int16)
+        if decoded.nchannels > 1:
+            samples = samples.reshape(-1, decoded.nchannels).mean(axis=1).astype(np.int16)
+        return AudioClip(samples, decoded.sample_rate)
+
+    def _synthesize_gtts(self, sentence, lang_code) -> AudioClip:
+        return self._decode_mp3(self._fetch_gtts(sentence, lang_code))
+
+    def synthesize(self, sentence, lang_code) -> AudioClip:
+        key = self._cache_key(sentence, lang_code)
+        clip = self.cache.get(key)
+        if clip is None:
             try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                return
-            except PermissionError:
-                time.sleep(delay)
-        print(f"⚠️ Could not delete file: {file_path}")
+                mp3 = self._fetch_gtts(sentence, lang_code)
+            except (gTTSError, requests.RequestException):
+                # Only network trouble says anything about connectivity; decode errors don't
+                self.connectivity.report_failure()
+                raise
+            self.connectivity.report_success()
+            clip = self._decode_mp3(mp3)
+            self.cache.put(key, clip)
+        return clip
 
-    def play_audio(self, file_path):
-        try:
-            pygame.mixer.quit()
-            pygame.mixer.init(devicename=self.get_device_name())
-        except Exception as e:
-            print(f"⚠️ Failed to init pygame mixer with output device: {e}")
-            pygame.mixer.init()  # fallback
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.play()
-        while pygame.mixer.music.get_busy():
-            time.sleep(0.1)
-        pygame.mixer.quit()
+    def prewarm(self, phrases, lang_code):
+        return self.cache.prewarm(phrases, lang_code, self.voice, self._synthesize_gtts)
 
-    def get_device_name(self):
-        """Returns device name for selected output index, used in pygame."""
-        if self.output_device_index is None:
-            return None
-        try:
-            device = sd.query_devices(self.output_device_index)
-            return device['name']
-        except Exception as e:
-            print(f"⚠️ Failed to get speaker name: {e}")
-            return None
+    def play_clip(self, clip: AudioClip) -> PlaybackHandle:
+        """Queue a decoded clip on the device's persistent output stream; returns without waiting."""
+        return get_playback(self.output_device_index).enqueue(clip.samples, clip.sample_rate)
 
-    def speak(self, text, lang_code):
-        if self.is_connected():
+    def stop(self):
+        """Silence the selected output device immediately, including offline speech in progress."""
+        get_playback(self.output_device_index).stop()
+        if self._engine is not None:
             try:
-                print("🌐 Using gTTS (online)...")
-                project_root = os.path.dirname(os.path.abspath(__file__))
-                data_dir = os.path.join(project_root, "data")
-                os.makedirs(data_dir, exist_ok=True)
+                self._engine.stop()
+            except Exception as e:
+                print(f"❌ pyttsx3 stop failed: {e}")
+
+    def _speak_streaming(self, sentences, lang_code, cancelled: Callable[[], bool]) -> List[str]:
+        """
+        Synthesize on a background thread, at most `lookahead` sentences ahead, while this
+        thread queues playback. The next sentence is queued while the current one is still
+        playing, so there is no gap between them. Returns the sentences that still need an
+        offline fallback: empty unless online synthesis or playback failed part way.
+        """
+        segments = queue.Queue(maxsize=self.lookahead)
+        done = threading.Event()
 
-                mp3_path = os.path.join(data_dir, "gtts_output.mp3")
+        def produce():
+            for sentence in sentences:
+                try:
+                    item = self.synthesize(sentence, lang_code)
+                except Exception as e:
+                    item = e
+                while not done.is_set():
+                    try:
+                        segments.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if done.is_set() or isinstance(item, Exception):
+                    return
 
-                tts = gTTS(text=text, lang=lang_code)
-                tts.save(mp3_path)
+        def wait_played(handle: PlaybackHandle) -> bool:
+            while not handle.wait(timeout=0.1):
+                if cancelled():
+                    self.stop()
+            return handle.completed
 
-                self.play_audio(mp3_path)
-                self.safe_delete(mp3_path)
+        threading.Thread(target=produce, name="tts-synthesize", daemon=True).start()
+        played = 0
+        playing: Optional[PlaybackHandle] = None
+        try:
+            for _ in sentences:
+                if cancelled():
+                    break
+                item = segments.get()
+                if isinstance(item, Exception):
+                    print(f"❌ gTTS failed or playback error: {item}")
+                    break
+                queued = self.play_clip(item)
+                if playing is not None:
+                    if not wait_played(playing):
+                        return []  # stopped: nothing should be spoken after this
+                    played += 1
+                playing = queued
+            if playing is not None and not wait_played(playing):
+                return []
+            played += 1 if playing is not None else 0
+        except Exception as e:
+            print(f"❌ gTTS failed or playback error: {e}")
+        finally:
+            done.set()
+        return [] if cancelled() else sentences[played:]
+
+    def get_device_name(self):
+        """Returns device name for selected output index (cached per device)."""
+        return device_name(self.output_device_index)
+
+    def speak(self, text, lang_code, cancelled: Optional[Callable[[], bool]] = None):
+        """Speak `text`; `cancelled` is checked between sentences so a stop takes effect quickly."""
+        cancelled = cancelled or (lambda: False)
+        sentences = split_sentences(text)
+        # Fully cached text (e.g. a replay) needs neither the network nor the connectivity probe
+        cached = all(self.cache.get(self._cache_key(sentence, lang_code)) is not None for sentence in sentences)
+        if cached or self.is_connected():
+            print("🔁 Replaying cached speech..." if cached else "🌐 Using gTTS (online)...")
+            remaining = self._speak_streaming(sentences, lang_code, cancelled)
+            if not remaining:
                 return
-            except Exception as e:
-                print(f"❌ gTTS failed or playback error: {e}")
+            # Only the part that wasn't heard yet goes to the offline engine
+            text = " ".join(remaining)
 
         print("📴 Falling back to offline pyttsx3...")
         try:
@@ -0,0 +1,153 @@
+# services/tts_service.py
+
+import heapq
+import itertools
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from services.tts_engine import TTSEngine
+
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10  # e.g. an explicit "Speak" click, which should jump ahead of queued speech
+
+
+class SpeechRequest:
+    """One queued utterance. `completed` is False if it was cancelled, preempted or failed."""
+    def __init__(self, request_id: int, text: str, lang_code: str, device_index: Optional[int], priority: int,
+                 on_done: Optional[Callable[["SpeechRequest"], None]]):
+        self.id = request_id
+        self.text = text
+        self.lang_code = lang_code
+        self.device_index = device_index
+        self.priority = priority
+        self.on_done = on_done
+        self.completed = False
+        self._cancel_event = threading.Event()
+        self._done = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class TTSService:
+    """
+    The one speaker for the whole app. Requests from every page go through a single queue and
+    are spoken one at a time by one worker thread, so utterances never overlap and the offline
+    engine is never re-entered. Higher priority goes first, FIFO otherwise. `preempt=True`
+    drops whatever is queued or playing, and when more than `max_queued` requests are waiting,
+    the oldest normal-priority ones are dropped as stale so continuous input doesn't fall behind.
+    """
+    def __init__(self, engine: Optional[TTSEngine] = None, max_queued: int = 3):
+        self.engine = engine or TTSEngine()
+        self.max_queued = max_queued
+        self._queue: List[Tuple[int, int, SpeechRequest]] = []
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._current: Optional[SpeechRequest] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="tts-service", daemon=True)
+        self._thread.start()
+
+    def speak(self, text: str, lang_code: str, device_index: Optional[int] = None,
+              priority: int = PRIORITY_NORMAL, preempt: bool = False,
+              on_done: Optional[Callable[[SpeechRequest], None]] = None) -> SpeechRequest:
+        """Queue `text`; returns at once. `on_done(request)` runs on the service thread."""
+        request_id = next(self._ids)
+        request = SpeechRequest(request_id, text, lang_code, device_index, priority, on_done)
+        with self._cond:
+            if preempt:
+                self._cancel_all_locked()
+            heapq.heappush(self._queue, (-priority, request_id, request))
+            self._drop_stale_locked()
+            self._cond.notify()
+        return request
+
+    def stop(self):
+        """Silence the current utterance and drop everything queued."""
+        with self._cond:
+            self._cancel_all_locked()
+
+    @property
+    def is_speaking(self) -> bool:
+        with self._cond:
+            return self._current is not None or any(not entry[2].cancelled for entry in self._queue)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._cancel_all_locked()
+            self._cond.notify()
+
+    def _cancel_all_locked(self):
+        for _, _, request in self._queue:
+            request.cancel()
+        if self._current is not None:
+            self._current.cancel()
+            # Don't wait for the worker's next cancellation check; cut the audio now
+            self.engine.stop()
+
+    def _drop_stale_locked(self):
+        waiting = [entry for entry in self._queue if not entry[2].cancelled]
+        stale = sorted((entry for entry in waiting if entry[2].priority == PRIORITY_NORMAL), key=lambda e: e[1])
+        for _, _, request in stale[:max(0, len(waiting) - self.max_queued)]:
+            request.cancel()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    pending = [entry[2] for entry in self._queue]
+                    self._queue.clear()
+                    break
+                request = heapq.heappop(self._queue)[2]
+                self._current = request
+            try:
+                if not request.cancelled:
+                    self.engine.set_output_device(request.device_index)
+                    self.engine.speak(request.text, request.lang_code, cancelled=lambda: request.cancelled)
+                    request.completed = not request.cancelled
+            except Exception as e:
+                print(f"[TTSService] failed: {e}")
+            finally:
+                with self._cond:
+                    self._current = None
+                self._finish(request)
+        for request in pending:
+            self._finish(request)
+
+    @staticmethod
+    def _finish(request: SpeechRequest):
+        request._done.set()
+        if request.on_done:
+            try:
+                request.on_done(request)
+            except Exception as e:
+                print(f"[TTSService] on_done failed: {e}")
+
+
+_service: Optional[TTSService] = None
+_service_lock = threading.Lock()
+
+
+def get_tts_service() -> TTSService:
+    """The process-wide TTS service shared by every page."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TTSService()
+        return _service
+
+
+def shutdown():
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
@@ -0,0 +1,132 @@
+# services/worker_pools.py
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class BoundedExecutor:
+    """
+    ThreadPoolExecutor with a cap on queued + running work.
+    `submit` blocks once `max_pending` tasks are outstanding, pushing back on the caller
+    instead of letting the queue grow with document size.
+    """
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Future:
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"[{self.name}] queue full ({self.max_pending} pending)")
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class DelayedCall:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """One timer thread for delayed callbacks (e.g. hedged requests), instead of a Timer per call."""
+    def __init__(self, name: str = "scheduler"):
+        self._heap: List[Tuple[float, int, DelayedCall, Callable]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def call_later(self, delay: float, fn: Callable) -> DelayedCall:
+        handle = DelayedCall()
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), handle, fn))
+            self._cond.notify()
+        return handle
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if self._closed:
+                    return
+                _, _, handle, fn = heapq.heappop(self._heap)
+            if not handle.cancelled:
+                try:
+                    fn()
+                except Exception as e:
+                    print(f"[Scheduler] callback failed: {e}")
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._cond.notify()
+
+
+class WorkerPools:
+    """
+    Long-lived executors shared by every translation request, one per backend:
+    network-bound Google calls, CPU-bound Marian inference and the LLaMA calls.
+    """
+    DEFAULT_SIZES = {
+        # name: (max_workers, max_pending)
+        "google": (8, 64),
+        # Marian workers mostly wait on the micro-batcher, which runs one generate() at a time
+        "marian": (4, 64),
+        "llama": (1, 32),
+    }
+
+    def __init__(self, sizes: Optional[Dict[str, tuple]] = None):
+        sizes = {**self.DEFAULT_SIZES, **(sizes or {})}
+        self._pools: Dict[str, BoundedExecutor] = {
+            name: BoundedExecutor(name, workers, pending) for name, (workers, pending) in sizes.items()
+        }
+        self.scheduler = Scheduler()
+        self._closed = False
+
+    def __getitem__(self, name: str) -> BoundedExecutor:
+        return self._pools[name]
+
+    def stats(self) -> Dict[str, int]:
+        return {name: pool.pending for name, pool in self._pools.items()}
+
+    def shutdown(self, wait: bool = False):
+        if self._closed:
+            return
+        self._closed = True
+        self.scheduler.shutdown()
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)